@@ -6,24 +6,28 @@
 
 from app.cards.card import Card as BaseCard
 
+# number of distinct ranks by blackjack value: the ace and the cards with value 2 to 10
+RANK_COUNT = 10
+
 class Card(BaseCard):
 
-  def __init__(self, shape=None, face_value=None):
-    BaseCard.__init__(self, shape, face_value)
+  __slots__ = ()
 
-  def get_normalized_value(self):
-    try:
-      self.normalized_value = int(self.face_value)
-    except ValueError:
-      if self.face_value in ['J', 'Q', 'K']:
-        self.normalized_value = 10
-      else:
-        # In BlackJack, A can have a value of 1 or 11
-        # If the total value of cards is less than or equal to 10,
-        # the value is changed to 11 else it will defaulted to 1
-        #
-        # We will set it to 1 and override the value on the game logic
-        self.normalized_value = 1
+  # In BlackJack, A can have a value of 1 or 11
+  # If the total value of cards is less than or equal to 10,
+  # the value is changed to 11 else it will defaulted to 1
+  #
+  # We will set it to 1 and override the value on the game logic
+  FACE_NORMALIZED_VALUES = {
+    'A': 1,
+    'J': 10,
+    'Q': 10,
+    'K': 10
+  }
 
-    return self.normalized_value
+  def get_rank_index(self):
+    # index 0 is the ace and index 1 to 9 are the cards with normalized value 2 to 10
+    if self.face_value == 'A':
+      return 0
 
+    return self.normalized_value - 1
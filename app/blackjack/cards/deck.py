@@ -4,29 +4,35 @@
 # Licensed under MIT
 # Version 2.0.0
 
-from app.blackjack.cards.card import Card
-from app.cards.card import FACE_VALUES, SHAPES
+from app.blackjack.cards.card import Card, RANK_COUNT
 from app.cards.deck import Deck as BaseDeck
-from app.cards.transformer import CardToTextTransformer
+from app.cards.transformer import CardToCodeTransformer
 import Pyro4
 
 class Deck(BaseDeck):
 
-  def __init__(self):
-    BaseDeck.__init__(self)
+  def __init__(self, rng=None):
+    BaseDeck.__init__(self, rng)
 
   def create(self):
     self.cards.clear()
 
-    for shape in SHAPES:
-      for face_value in FACE_VALUES:
-        self.cards.append(Card(shape, face_value))
+    # reuse the shared card instances instead of allocating new ones
+    self.cards.extend(Card.get_all())
+
+  def get_composition(self):
+    composition = [0] * RANK_COUNT
+
+    for card in self.cards:
+      composition[card.get_rank_index()] += 1
+
+    return tuple(composition)
 
 @Pyro4.expose
 class SerializableDeck(Deck):
 
-  def __init__(self):
-    Deck.__init__(self)
+  def __init__(self, rng=None):
+    Deck.__init__(self, rng)
 
   def create(self):
     Deck.create(self)
@@ -40,7 +46,7 @@ class SerializableDeck(Deck):
     serialized = []
 
     for card in plucked:
-      serialized.append(CardToTextTransformer(card).transform())
+      serialized.append(CardToCodeTransformer(card).transform())
 
     return serialized
 
@@ -50,11 +56,14 @@ class SerializableDeck(Deck):
     serialized = []
 
     for card in cards:
-      serialized.append(CardToTextTransformer(card).transform())
+      serialized.append(CardToCodeTransformer(card).transform())
 
     return serialized
 
   def get_remaining_cards(self):
     return Deck.get_remaining_cards(self)
 
+  def get_composition(self):
+    return Deck.get_composition(self)
+
 
@@ -0,0 +1,84 @@
+# shoe.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+from app.blackjack.cards.card import Card, RANK_COUNT
+from app.cards.shoe import Shoe as BaseShoe
+from app.cards.error import DeckError
+from app.tracing import traced
+import Pyro4
+
+# blackjack rank of each card code
+CODE_RANKS = [card.get_rank_index() for card in Card.get_all()]
+
+class Shoe(BaseShoe):
+
+  card_class = Card
+
+  def __init__(self, decks=1, penetration=0.75, rng=None):
+    BaseShoe.__init__(self, decks, penetration, rng)
+
+    # number of remaining cards per rank
+    self.composition = [0] * RANK_COUNT
+
+  def create(self):
+    BaseShoe.create(self)
+    self.reset_composition()
+
+  def shuffle(self):
+    BaseShoe.shuffle(self)
+    self.reset_composition()
+
+  def reset_composition(self):
+    for rank_idx in range(0, RANK_COUNT):
+      self.composition[rank_idx] = 0
+
+    for code in self.cards:
+      self.composition[CODE_RANKS[code]] += 1
+
+  def draw_codes(self, number_of_cards):
+    codes = BaseShoe.draw_codes(self, number_of_cards)
+
+    for code in codes:
+      self.composition[CODE_RANKS[code]] -= 1
+
+    return codes
+
+  def get_composition(self):
+    return tuple(self.composition)
+
+@Pyro4.expose
+class SerializableShoe(Shoe):
+
+  def __init__(self, decks=1, penetration=0.75, rng=None):
+    Shoe.__init__(self, decks, penetration, rng)
+
+  @traced('deck')
+  def create(self):
+    Shoe.create(self)
+
+  @traced('deck')
+  def shuffle(self):
+    Shoe.shuffle(self)
+
+  @traced('deck')
+  def pluck(self, number_of_cards):
+    # the shoe already stores the serialized form of the cards
+    return self.draw_codes(number_of_cards)
+
+  def get_cards(self):
+    if len(self.cards) == 0:
+      raise DeckError("No cards in shoe. call Shoe.create()")
+
+    return self.cards[self.cursor:].tolist()
+
+  def get_remaining_cards(self):
+    return Shoe.get_remaining_cards(self)
+
+  def needs_reshuffle(self):
+    return Shoe.needs_reshuffle(self)
+
+  def get_composition(self):
+    return Shoe.get_composition(self)
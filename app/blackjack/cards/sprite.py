@@ -0,0 +1,24 @@
+# sprite.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+from app.blackjack.cards.card import Card
+from app.cards.error import TransformerError
+from app.cards.sprite import get_card_attrs, \
+  CardImagePositionToCardTransformer as BaseCardImagePositionToCardTransformer
+
+class CardImagePositionToCardTransformer(BaseCardImagePositionToCardTransformer):
+  """Transformer class for x and y coordinates back to black jack card instance"""
+
+  def __init__(self, position=None):
+    BaseCardImagePositionToCardTransformer.__init__(self, position)
+
+  def transform(self):
+    if self.position is None:
+      raise TransformerError("Set coordinates first before transforming it.")
+
+    card_attrs = get_card_attrs(self.position)
+
+    return Card.get(card_attrs['shape'], card_attrs['face'])
@@ -8,8 +8,8 @@ import re
 from app.blackjack.cards.card import Card
 from app.cards.card import SHAPES
 from app.cards.error import TransformerError
-from app.cards.transformer import get_card_attrs, TextToCardTransformer as BaseTextToCardTransformer, \
-  CardImagePositionToCardTransformer as BaseCardImagePositionToCardTransformer
+from app.cards.transformer import get_code_attrs, TextToCardTransformer as BaseTextToCardTransformer, \
+  CodeToCardTransformer as BaseCodeToCardTransformer
 
 class TextToCardTransformer(BaseTextToCardTransformer):
   """Transformer class for deserializing text back to black jack card instances"""
@@ -26,20 +26,19 @@ class TextToCardTransformer(BaseTextToCardTransformer):
     if not matches:
       raise TransformerError("Cant deserialize card: %s" % self.text)
 
-    return Card(matches.group(2), matches.group(1))
+    return Card.get(matches.group(2), matches.group(1))
 
-class CardImagePositionToCardTransformer(BaseCardImagePositionToCardTransformer):
-  """Transformer class for x and y coordinates back to black jack card instance"""
+class CodeToCardTransformer(BaseCodeToCardTransformer):
+  """Transformer class for deserializing integer codes back to black jack card instances"""
 
-  def __init__(self, position=None):
-    BaseCardImagePositionToCardTransformer.__init__(self, position)
+  def __init__(self, code=None):
+    BaseCodeToCardTransformer.__init__(self, code)
 
   def transform(self):
-    if self.position is None:
-      raise TransformerError("Set coordinates first before transforming it.")
-
-    card_attrs = get_card_attrs(self.position)
-
-    return Card(card_attrs['shape'], card_attrs['face'])
+    if self.code is None:
+      raise TransformerError("Set a card code first before transforming it")
 
+    # validate the code before looking up the shared card instance
+    get_code_attrs(self.code)
 
+    return Card.from_code(self.code)
@@ -0,0 +1,75 @@
+# admin.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import threading
+from Pyro4.core import Daemon as PyroDaemon
+import Pyro4
+
+# Operations for the operators of the server. They are served by a daemon of their own on
+# a separate host and port so that the game clients connected to the manager can't reach
+# them, e.g. to turn on the memory tracing that slows down every allocation of the server
+@Pyro4.expose
+class Admin(object):
+
+  def __init__(self, profiler):
+    # stack sampler and memory snapshots of the server
+    self.profiler = profiler
+
+  def get_profile(self):
+    # collapsed stacks sampled since the server started
+    return {
+      'stats': self.profiler.get_stats(),
+      'collapsed': self.profiler.collapsed()
+    }
+
+  def snapshot_memory(self, limit=20):
+    # the first call starts tracing the allocations, the next ones report the largest and growing ones
+    return self.profiler.snapshot_memory(limit)
+
+  def stop_memory_tracing(self):
+    return self.profiler.stop_memory_tracing()
+
+class AdminServer(object):
+  """Serves the admin object from a background thread next to the game server."""
+
+  def __init__(self, admin):
+    self.admin = admin
+
+    # only reachable from the server host unless bound to another interface
+    self.server_host = "localhost"
+    self.server_port = 3001
+
+    self.daemon = None
+    self.thread = None
+
+  def start(self, adminlabel=None):
+    if adminlabel is None:
+      adminlabel = "standard.admin"
+
+    # the daemon is created before the game server changes the pyro settings
+    self.daemon = PyroDaemon(host=self.server_host, port=self.server_port)
+    uri = self.daemon.register(self.admin, adminlabel)
+
+    print("Admin object available at %s" % uri)
+
+    self.thread = threading.Thread(name="admin_thread", target=self.daemon.requestLoop)
+    self.thread.daemon = True
+    self.thread.start()
+
+  def get_admin(self):
+    return self.admin
+
+  def get_host(self):
+    return self.server_host
+
+  def set_host(self, host: str):
+    self.server_host = host
+
+  def get_port(self):
+    return self.server_port
+
+  def set_port(self, port: int):
+    self.server_port = port
@@ -0,0 +1,285 @@
+# async_server.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from app.blackjack.game.manager import Manager
+from app.blackjack.game.room import MAX_EVENT_WAIT
+from app.blackjack.game.error import GameError
+
+# longest request line accepted from a client
+MAX_LINE_SIZE = 1024 * 1024
+
+# clients that can't keep up with the pushed events are disconnected once this much is buffered
+MAX_WRITE_BUFFER = 1024 * 1024
+
+# manager operations that never take a room or registry lock and run on the event loop.
+# Every other operation can wait for a lock, or for a shoe being shuffled while a room is
+# locked, so those run on the worker threads to keep the event loop serving the other clients
+LOCK_FREE_METHODS = ['get_event_seq', 'get_table_snapshot', 'get_metrics', 'get_trace_events']
+
+# worker threads running the manager operations
+WORKER_THREADS = 40
+
+class Connection(object):
+  """Client connection of the asyncio server."""
+
+  def __init__(self, reader, writer):
+    self.reader = reader
+    self.writer = writer
+
+    # rooms the client receives events from
+    self.rooms = set()
+
+    # requests that are still being handled
+    self.tasks = set()
+
+  def send(self, message):
+    if self.writer.transport.is_closing():
+      return
+
+    # drop clients that stopped reading instead of buffering without bounds
+    if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+      self.writer.close()
+      return
+
+    self.writer.write(json.dumps(message).encode('utf-8') + b'\n')
+
+# Requests are one JSON object per line:
+#   {"id": 1, "method": "draw_cards", "args": [...], "kwargs": {...}}
+# and are answered with:
+#   {"id": 1, "result": ...} or {"id": 1, "error": {"type": ..., "message": ...}}
+# After {"method": "subscribe", "args": [room_id]} the events of the room are pushed as:
+#   {"room_id": room_id, "event": {...}}
+class AsyncServer(object):
+  """Serves the manager operations over TCP with asyncio and pushes room events."""
+
+  def __init__(self, game_manager=None):
+    # initialize game manager
+    if game_manager is None:
+      game_manager = Manager()
+
+    self.game_manager = game_manager
+
+    # store connection details
+    self.server_host = "localhost"
+    self.server_port = 3000
+
+    # operations of the manager callable by the clients
+    self.methods = {}
+
+    # subscribed connections of each room
+    self.subscriptions = {}
+
+    # futures of the wait_for_events calls parked on the event loop, per room
+    self.waiters = {}
+
+    # runs the operations that take locks. Waiting for events does not hold a thread
+    self.worker_threads = WORKER_THREADS
+    self.executor = None
+
+    # number of open client connections
+    self.connection_count = 0
+
+    self.loop = None
+
+  def start(self):
+    # operations are exposed the same way pyro exposes them
+    for name in dir(self.game_manager):
+      if not name.startswith('_') and callable(getattr(self.game_manager, name)):
+        self.methods[name] = getattr(self.game_manager, name)
+
+    self.loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(self.loop)
+
+    self.executor = ThreadPoolExecutor(self.worker_threads, thread_name_prefix="asyncio-worker")
+
+    # events are published from whichever thread changed the room
+    self.game_manager.listeners.append(self.on_event)
+
+    self.game_manager.metrics.set_gauge('open_connections', lambda: self.connection_count)
+
+    server = self.loop.run_until_complete(
+      asyncio.start_server(self.serve, self.server_host, self.server_port, limit=MAX_LINE_SIZE, backlog=1024)
+    )
+
+    print("Asyncio server running on %s:%d" % (self.server_host, self.server_port))
+
+    try:
+      self.loop.run_forever()
+    except KeyboardInterrupt:
+      pass
+    finally:
+      self.game_manager.listeners.remove(self.on_event)
+
+      server.close()
+      self.loop.run_until_complete(server.wait_closed())
+      self.loop.close()
+
+      self.executor.shutdown(wait=False)
+
+  def on_event(self, room_id, event):
+    # called with the room locked so it only hands the event over to the loop
+    if room_id in self.subscriptions or room_id in self.waiters:
+      self.loop.call_soon_threadsafe(self.push_event, room_id, event)
+
+  def push_event(self, room_id, event):
+    # wake up the clients waiting for events of the room
+    for waiter in self.waiters.pop(room_id, []):
+      if not waiter.done():
+        waiter.set_result(None)
+
+    for connection in list(self.subscriptions.get(room_id, [])):
+      connection.send({
+        'room_id': room_id,
+        'event': event
+      })
+
+  def subscribe(self, connection, room_id):
+    # raises for rooms that don't exist before anything is registered
+    seq = self.game_manager.get_event_seq(room_id)
+
+    self.subscriptions.setdefault(room_id, set()).add(connection)
+    connection.rooms.add(room_id)
+
+    return seq
+
+  def unsubscribe(self, connection, room_id):
+    if room_id in self.subscriptions:
+      self.subscriptions[room_id].discard(connection)
+
+      if len(self.subscriptions[room_id]) == 0:
+        del self.subscriptions[room_id]
+
+    connection.rooms.discard(room_id)
+
+    return True
+
+  async def serve(self, reader, writer):
+    connection = Connection(reader, writer)
+
+    self.connection_count += 1
+    self.game_manager.metrics.increment('connections_opened')
+
+    try:
+      while True:
+        try:
+          line = await reader.readline()
+        except (ValueError, ConnectionError):
+          break
+
+        if not line:
+          break
+
+        # requests are answered in order of completion. Blocking ones don't hold up the rest
+        task = asyncio.ensure_future(self.handle(connection, line))
+
+        connection.tasks.add(task)
+        task.add_done_callback(connection.tasks.discard)
+    finally:
+      for room_id in list(connection.rooms):
+        self.unsubscribe(connection, room_id)
+
+      self.connection_count -= 1
+
+      writer.close()
+
+  async def handle(self, connection, line):
+    request_id = None
+
+    try:
+      request = json.loads(line.decode('utf-8'))
+      request_id = request.get('id')
+
+      result = await self.dispatch(connection,
+                                   request.get('method'),
+                                   request.get('args', []),
+                                   request.get('kwargs', {}))
+
+      connection.send({
+        'id': request_id,
+        'result': result
+      })
+    except Exception as error:
+      connection.send({
+        'id': request_id,
+        'error': {
+          'type': type(error).__name__,
+          'message': getattr(error, 'message', str(error))
+        }
+      })
+
+  async def dispatch(self, connection, method, args, kwargs):
+    if method == 'subscribe':
+      return self.subscribe(connection, *args)
+
+    if method == 'unsubscribe':
+      return self.unsubscribe(connection, *args)
+
+    if not method in self.methods:
+      raise GameError("Method: %s does not exist." % method)
+
+    if method == 'wait_for_events':
+      return await self.wait_for_events(*args, **kwargs)
+
+    if method in LOCK_FREE_METHODS:
+      return self.methods[method](*args, **kwargs)
+
+    return await self.loop.run_in_executor(self.executor, lambda: self.methods[method](*args, **kwargs))
+
+  async def wait_for_events(self, room_id, since_seq=0, timeout=MAX_EVENT_WAIT):
+    timeout = max(0, min(timeout, MAX_EVENT_WAIT))
+
+    # the waiter is registered before the sequence is read so that an event published in
+    # between still wakes it up
+    waiter = self.loop.create_future()
+    self.waiters.setdefault(room_id, set()).add(waiter)
+
+    try:
+      if timeout > 0 and self.game_manager.get_event_seq(room_id) <= since_seq:
+        try:
+          await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+          pass
+    finally:
+      waiters = self.waiters.get(room_id)
+
+      if waiters is not None:
+        waiters.discard(waiter)
+
+        if len(waiters) == 0:
+          del self.waiters[room_id]
+
+    # the events are read without waiting once there is something to read or the time is up
+    return await self.loop.run_in_executor(self.executor, self.methods['wait_for_events'], room_id, since_seq, 0)
+
+  def get_game_manager(self):
+    return self.game_manager
+
+  def set_game_manager(self, game_manager: Manager):
+    self.game_manager = game_manager
+
+  def get_host(self):
+    return self.server_host
+
+  def set_host(self, host: str):
+    self.server_host = host
+
+  def get_port(self):
+    return self.server_port
+
+  def set_port(self, port: int):
+    self.server_port = port
+
+  def get_worker_threads(self):
+    return self.worker_threads
+
+  def set_worker_threads(self, worker_threads: int):
+    if worker_threads < 1:
+      raise GameError("Worker threads should be at least 1.")
+
+    self.worker_threads = worker_threads
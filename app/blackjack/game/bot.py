@@ -0,0 +1,199 @@
+# bot.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import time
+from app.blackjack.game.room import MAX_PLAYERS
+
+# seconds each call waits for room events
+EVENT_WAIT = 5
+
+class CallStats(object):
+  """Latencies and errors of the manager calls of one or more bots."""
+
+  def __init__(self):
+    self.latencies = {}
+    self.errors = {}
+
+    # completed rounds per player and rounds weighted by the number of players of the table
+    self.hands = 0
+    self.rounds = 0.0
+
+    # bots that never got a seat at a table, either full or short of players
+    self.failed_joins = 0
+
+  def record(self, method, latency, failed=False):
+    self.latencies.setdefault(method, []).append(latency)
+
+    if failed is True:
+      self.errors[method] = self.errors.get(method, 0) + 1
+
+  def merge(self, other):
+    for method, latencies in other.latencies.items():
+      self.latencies.setdefault(method, []).extend(latencies)
+
+    for method, count in other.errors.items():
+      self.errors[method] = self.errors.get(method, 0) + count
+
+    self.hands += other.hands
+    self.rounds += other.rounds
+    self.failed_joins += other.failed_joins
+
+class TimedManager(object):
+  """Wraps a game manager proxy and records the latency of every call."""
+
+  def __init__(self, game_manager, stats):
+    self.game_manager = game_manager
+    self.stats = stats
+
+  def __getattr__(self, method):
+    remote = getattr(self.game_manager, method)
+
+    def call(*args, **kwargs):
+      start = time.perf_counter()
+
+      try:
+        result = remote(*args, **kwargs)
+      except Exception:
+        self.stats.record(method, time.perf_counter() - start, True)
+        raise
+
+      # batches report their failures in the response instead of raising
+      failed = method == 'execute' and isinstance(result, dict) and result.get('error') is not None
+
+      self.stats.record(method, time.perf_counter() - start, failed)
+
+      return result
+
+    return call
+
+class Bot(object):
+  """Headless player that follows the same protocol as the game window."""
+
+  def __init__(self, game_manager, name, stats=None, stand_on=17, table_size=MAX_PLAYERS, join_timeout=30):
+    if stats is None:
+      stats = CallStats()
+
+    self.stats = stats
+    self.game_manager = TimedManager(game_manager, stats)
+
+    self.name = name
+    self.stand_on = stand_on
+
+    # the round starts when the table is full or, after the timeout, when at least 2 players are ready
+    self.table_size = table_size
+    self.join_timeout = join_timeout
+
+    self.connection_uid = None
+    self.room_id = None
+
+  def play(self, deadline):
+    if self.join() is False:
+      self.stats.failed_joins += 1
+      return
+
+    try:
+      while time.time() < deadline:
+        if self.play_round(deadline) is False:
+          break
+
+        # start the next round right away like a player answering "OK"
+        self.game_manager.execute([
+          {'method': 'new_game', 'args': [self.connection_uid]},
+          {'method': 'make_ready', 'args': [self.connection_uid, True]}
+        ])
+
+        if self.wait_for_acknowledgement(deadline) is False:
+          break
+    finally:
+      self.game_manager.disconnect(self.connection_uid)
+
+  def join(self):
+    connection = self.game_manager.connect(self.name, None, True)
+
+    if connection is False:
+      return False
+
+    self.connection_uid = connection['connection_uid']
+    self.room_id = connection['room_id']
+
+    end_time = time.time() + self.join_timeout
+    since_seq = 0
+
+    while True:
+      remaining = end_time - time.time()
+
+      response = self.game_manager.wait_for_events(self.room_id, since_seq, max(0, min(remaining, EVENT_WAIT)))
+      since_seq = response['seq']
+
+      if response['ready_count'] >= self.table_size or (remaining <= 0 and response['ready_count'] > 1):
+        break
+
+      if remaining <= 0:
+        self.game_manager.disconnect(self.connection_uid)
+        return False
+
+    # lock the game to prevent other players from joining
+    self.game_manager.lock_game(self.room_id, True)
+
+    return True
+
+  def play_round(self, deadline):
+    dealt = self.game_manager.deal_round(self.room_id)
+
+    card_total = dealt['totals'].get(self.connection_uid, 0)
+
+    while card_total < self.stand_on:
+      response = self.game_manager.execute([
+        {'method': 'draw_cards', 'args': [self.connection_uid, 1]},
+        {'method': 'get_player_card_total', 'args': [self.connection_uid]}
+      ])
+
+      if response['error'] is not None:
+        break
+
+      card_total = response['results'][1]
+
+    # the winners are announced once every hand is locked
+    since_seq = self.game_manager.get_event_seq(self.room_id)
+
+    self.game_manager.lock_hand(self.connection_uid, True)
+
+    winners = self.game_manager.determine_winners(self.room_id)
+
+    # a faster player can start the next round before the winners are seen so the event
+    # is looked for instead of asking for the winners again
+    while winners is None:
+      if time.time() > deadline + EVENT_WAIT * 2:
+        return False
+
+      response = self.game_manager.wait_for_events(self.room_id, since_seq, EVENT_WAIT)
+      since_seq = response['seq']
+
+      for event in response['events']:
+        if event['type'] == 'winners_decided':
+          winners = event['data']
+
+      if response['missed'] is True and winners is None:
+        winners = self.game_manager.determine_winners(self.room_id)
+
+    self.stats.hands += 1
+    self.stats.rounds += 1.0 / max(1, len(dealt['hands']))
+
+    return True
+
+  def wait_for_acknowledgement(self, deadline):
+    since_seq = 0
+
+    while True:
+      if time.time() > deadline + EVENT_WAIT * 2:
+        return False
+
+      response = self.game_manager.wait_for_events(self.room_id, since_seq, EVENT_WAIT)
+      since_seq = response['seq']
+
+      # all players are ready
+      if response['player_count'] == response['ready_count']:
+        return response['player_count'] > 1
@@ -0,0 +1,90 @@
+# hand.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+from app.blackjack.cards.card import Card
+
+def compute_total(card_total, ace_counter):
+  """Resolve the total of a hand from the sum of its non-ace cards and the number of aces."""
+
+  if card_total <= 10 and ace_counter == 1:
+    # add eleven to the card total when user has 1 ace card if the card total is less than or eq to 10
+    return card_total + 11
+  elif card_total > 10 and ace_counter >= 1:
+    # add 1 for each ace the user has when the card total is greater than 10
+    return card_total + ace_counter
+  elif card_total == 0 and ace_counter > 1:
+    # if the user's card consists of all aces then add set the initial total to 11
+    # and add 1 for each remaining ace card
+    return card_total + (11 + (ace_counter - 1))
+
+  return card_total
+
+def is_soft_total(card_total, ace_counter):
+  """Check whether one of the aces is counted as 11 in compute_total()."""
+
+  return (card_total <= 10 and ace_counter == 1) or (card_total == 0 and ace_counter > 1)
+
+class Hand(object):
+  """Running summary of the cards on hand so that totals are resolved without re-reading the cards."""
+
+  __slots__ = ('card_total', 'ace_count', 'card_count', 'total', 'first_card_total', 'soft')
+
+  def __init__(self):
+    self.clear()
+
+  def clear(self):
+    # sum of the normalized values of the non-ace cards
+    self.card_total = 0
+
+    # number of aces on hand
+    self.ace_count = 0
+
+    # number of cards on hand
+    self.card_count = 0
+
+    # resolved totals
+    self.total = 0
+    self.first_card_total = 0
+
+    # boolean if an ace is counted as 11
+    self.soft = False
+
+  def add(self, card: Card):
+    if card.get_face_value() == 'A':
+      self.ace_count += 1
+    else:
+      self.card_total += card.get_normalized_value()
+
+    self.card_count += 1
+
+    self.total = compute_total(self.card_total, self.ace_count)
+    self.soft = is_soft_total(self.card_total, self.ace_count)
+
+    # the first card total is used when the other cards are hidden
+    if self.card_count == 1:
+      self.first_card_total = self.total
+
+  def get_total(self, count_only_first=False):
+    if count_only_first is True:
+      return self.first_card_total
+
+    return self.total
+
+  def get_hard_total(self):
+    return self.card_total + self.ace_count
+
+  def is_soft(self):
+    return self.soft
+
+  def get_summary(self):
+    return {
+      'total': self.total,
+      'hard_total': self.get_hard_total(),
+      'ace_count': self.ace_count,
+      'card_count': self.card_count,
+      'is_soft': self.soft,
+      'first_card_total': self.first_card_total
+    }
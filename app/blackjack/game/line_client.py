@@ -0,0 +1,61 @@
+# line_client.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import json
+import socket
+import itertools
+from app.blackjack.game.error import GameError
+
+class LineClient(object):
+  """Blocking client of the asyncio transport. Manager operations are called like on a pyro proxy."""
+
+  def __init__(self, host="localhost", port=3000, timeout=60):
+    self.socket = socket.create_connection((host, port), timeout)
+    self.stream = self.socket.makefile('rwb')
+
+    self.request_ids = itertools.count(1)
+
+    # events pushed by the server while waiting for responses
+    self.events = []
+
+  def call(self, method, *args, **kwargs):
+    request_id = next(self.request_ids)
+
+    self.stream.write(json.dumps({
+      'id': request_id,
+      'method': method,
+      'args': list(args),
+      'kwargs': kwargs
+    }).encode('utf-8') + b'\n')
+
+    self.stream.flush()
+
+    while True:
+      line = self.stream.readline()
+
+      if not line:
+        raise GameError("Connection closed by the server.")
+
+      message = json.loads(line.decode('utf-8'))
+
+      if 'event' in message:
+        self.events.append(message)
+        continue
+
+      if message.get('id') != request_id:
+        continue
+
+      if 'error' in message:
+        raise GameError(message['error']['message'])
+
+      return message['result']
+
+  def close(self):
+    self.stream.close()
+    self.socket.close()
+
+  def __getattr__(self, method):
+    return lambda *args, **kwargs: self.call(method, *args, **kwargs)
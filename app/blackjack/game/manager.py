@@ -4,274 +4,391 @@
 # Licensed under MIT
 # Version 2.0.0
 
+import inspect
+import itertools
+import threading
 import Pyro4
 from app.logger import Logger
-from app.helpers import rand_uid, strip_uid
-from app.blackjack.cards.deck import SerializableDeck
-from app.blackjack.cards.transformer import TextToCardTransformer
-
-MAX_PLAYERS = 4
-
-# TODO: implement logic for incrementing 'games_played', 'total_wins' and 'total_losses'
+from app.metrics import Metrics, measured
+from app.tracing import tracer, traced
+from app.cards.pipeline import ShuffleWorker
+from app.blackjack.game.error import GameError
+from app.blackjack.game.odds import OddsCalculator
+from app.blackjack.game.room import Room, MAX_PLAYERS, MAX_EVENT_WAIT
+
+MAX_ROOMS = 500
+
+# operations allowed in Manager.execute(). Player operations take the player uid
+# as the first argument while room operations take the room id
+BATCH_PLAYER_METHODS = [
+  'new_game',
+  'draw_cards',
+  'get_player_card_total',
+  'get_player_hand',
+  'get_player_odds',
+  'lock_hand',
+  'make_ready'
+]
+
+BATCH_ROOM_METHODS = [
+  'get_event_seq',
+  'get_table_snapshot',
+  'get_states',
+  'get_player_cards',
+  'deal_round',
+  'determine_winners',
+  'lock_game',
+  'is_room_ready',
+  'player_count',
+  'player_ready_count',
+  'get_player_uids'
+]
+
+def operation(method):
+  # manager calls are measured and traced as a single span when tracing is enabled
+  return traced('manager')(measured(method))
+
+# Pyro calls the manager from many threads at once. Each room has its own lock which is
+# held for every operation on the room, so rooms never wait for each other. The registry
+# lock only guards the room and player lookups and is always taken before a room lock.
+# Snapshots and event sequence numbers are read without locks from published values
 @Pyro4.expose
 class Manager(object):
 
-  def __init__(self):
-    # create deck object
-    self.deck = SerializableDeck()
+  def __init__(self, decks=1, penetration=0.75, max_rooms=MAX_ROOMS):
+    # shoe settings of every room
+    self.decks = decks
+    self.penetration = penetration
+
+    # room registry
+    self.rooms = {}
+    self.max_rooms = max_rooms
+    self.room_ids = itertools.count(1)
+
+    # room of each connected player
+    self.player_rooms = {}
+
+    # guards changes to the rooms and player_rooms registries
+    self.registry_lock = threading.Lock()
+
+    # callables notified of the events of every room, e.g. transports pushing them to clients
+    self.listeners = []
 
-    # save state
-    self.states = {}
+    # calls, errors and latency of every operation plus the state of the rooms
+    self.metrics = Metrics()
+    self.metrics.set_gauge('active_rooms', lambda: len(self.rooms))
+    self.metrics.set_gauge('active_players', lambda: len(self.player_rooms))
 
     # message logging
     self.logger = Logger("BlackJack State Manager")
 
-    # boolean to determine whether a game is on going or not
-    self.room_locked = False
+    # the spare shoes of all rooms are shuffled by a single background thread
+    self.shuffle_worker = ShuffleWorker()
 
-    # boolean if new game is requested
-    self.is_new_game_requested = False
+    # exact odds of the hands against the remaining cards of the deck. Shared by the rooms
+    # so that positions computed for one table are reused by the others
+    self.odds = OddsCalculator()
 
-    # boolean if deck newly created
-    self.is_deck_refreshed = False
+  def _get_room(self, room_id):
+    room = self.rooms.get(room_id)
 
-    # blackjack goal number
-    self.winning_number = 21
+    if room is None:
+      raise GameError("Room: %s does not exist" % room_id)
 
-    # create the game deck
-    self.init_deck()
+    return room
 
-  def get_states(self):
-    return self.states
+  def _get_player_room(self, identifier):
+    room_id = self.player_rooms.get(identifier)
 
-  def init_deck(self):
-    # create the deck
-    self.deck.create()
+    if room_id is None:
+      raise GameError("Player: %s is not connected" % identifier)
 
-    # shuffle the deck
-    self.deck.shuffle()
+    return self._get_room(room_id)
 
-  def new_game(self, identifier):
-    if self.is_new_game_requested is False:
-      for _, state in self.states.items():
-        # make sure player is not ready
-        state['is_ready'] = False
+  def _call_room(self, room_id, method, *args):
+    room = self._get_room(room_id)
+
+    # room operations never interleave with each other or with a batch
+    with room.lock:
+      return getattr(room, method)(*args)
 
-      # set back to false to allow deck refresh
-      self.is_deck_refreshed = False
+  def _call_player_room(self, identifier, method, *args):
+    room = self._get_player_room(identifier)
 
-      # set to true to prevent executing this block on next call
-      self.is_new_game_requested = True
+    with room.lock:
+      return getattr(room, method)(identifier, *args)
 
-    # increment the number of games played
-    self.states[identifier]['games_played'] += 1
+  def _create_room(self):
+    if len(self.rooms) >= self.max_rooms:
+      return None
 
-    # unlock hand
-    self.states[identifier]['hand_locked'] = False
+    room_id = next(self.room_ids)
 
-    # empty the cards on hand
-    self.states[identifier]['cards_on_hand'] = []
+    self.rooms[room_id] = Room(room_id,
+                               self.decks,
+                               self.penetration,
+                               self.odds,
+                               self.shuffle_worker,
+                               self.logger,
+                               self.listeners,
+                               self.metrics)
 
     if self.logger != None:
-      self.logger.log('new_game', "Starting a new game.")
+      self.logger.info("create_room", "Room: %s created.", room_id)
 
-  # TODO: throw error when number_of_cards is less than 1
-  def draw_cards(self, identifier, number_of_cards=2):
-    drawn_cards = []
+    return self.rooms[room_id]
 
-    # do not invoke pluck when hand is locked
-    if self.states[identifier]['hand_locked'] is False:
-      drawn_cards = self.deck.pluck(number_of_cards)
+  @operation
+  def get_rooms(self):
+    result = []
 
-    if identifier in self.states and not 'cards_on_hand' in self.states[identifier]:
-      self.states[identifier]['cards_on_hand'] = []
+    with self.registry_lock:
+      rooms = list(self.rooms.items())
 
-    if identifier in self.states:
-      for card in drawn_cards:
-        self.states[identifier]['cards_on_hand'].append(card)
+    for room_id, room in rooms:
+      result.append({
+        'room_id': room_id,
+        'player_count': room.player_count(),
+        'max_players': MAX_PLAYERS,
+        'is_locked': room.room_locked
+      })
 
-      if self.logger != None:
-        self.logger.log("Drawn card. State of %s modified" % identifier, self.states[identifier])
+    return result
 
-    if self.logger != None:
-      self.logger.log("Drawn card. Remaining cards", self.deck.get_remaining_cards())
+  @operation
+  def get_event_seq(self, room_id):
+    return self._get_room(room_id).get_event_seq()
 
-    return drawn_cards
+  @operation
+  def wait_for_events(self, room_id, since_seq=0, timeout=MAX_EVENT_WAIT):
+    return self._get_room(room_id).wait_for_events(since_seq, timeout)
 
-  def get_player_cards(self, exclude_uids=None):
-    result = {}
+  @operation
+  def get_table_snapshot(self, room_id, since_version=0):
+    return self._get_room(room_id).get_table_snapshot(since_version)
 
-    for identifier, state in self.states.items():
-      # skip to the next iteration when the identifier needs to be excluded
-      if exclude_uids is not None and identifier in exclude_uids:
-        continue
+  @operation
+  def get_states(self, room_id):
+    return self._call_room(room_id, 'get_states')
 
-      on_hand = []
+  @operation
+  def new_game(self, identifier):
+    self._call_player_room(identifier, 'new_game')
 
-      if 'cards_on_hand' in state:
-        on_hand = state['cards_on_hand']
+  @operation
+  def draw_cards(self, identifier, number_of_cards=2):
+    return self._call_player_room(identifier, 'draw_cards', number_of_cards)
 
-      result[identifier] = on_hand
+  @operation
+  def deal_round(self, room_id):
+    return self._call_room(room_id, 'deal_round')
 
-    return result
+  @operation
+  def get_player_cards(self, room_id, exclude_uids=None, as_text=False):
+    return self._call_room(room_id, 'get_player_cards', exclude_uids, as_text)
 
+  @operation
   def get_player_card_total(self, identifier, count_only_first=False):
-    card_total = 0
-    ace_counter = 0
-
-    if identifier in self.states:
-      card_collection = self.states[identifier]['cards_on_hand']
-
-      # extract the first card
-      if count_only_first is True and len(card_collection) > 0:
-        card_collection = [card_collection[0]]
-
-      for card in card_collection:
-        card_obj = TextToCardTransformer(card).transform()
-        card_value = card_obj.get_normalized_value()
-
-        # increment the ace counter if we enconter one
-        if card_obj.get_face_value() == 'A':
-          ace_counter += 1
-          continue
-
-        card_total += card_value
-
-      if card_total <= 10 and ace_counter == 1:
-        # add eleven to the card total when user has 1 ace card if the card total is less than or eq to 10
-        card_total += 11
-      elif card_total > 10 and ace_counter >= 1:
-        # add 1 for each ace the user has when the card total is greater than 10
-        card_total += ace_counter
-      elif card_total == 0 and ace_counter > 1:
-        # if the user's card consists of all aces then add set the initial total to 11
-        # and add 1 for each remaining ace card
-        card_total += (11 + (ace_counter - 1))
-      else:
-        pass
+    if not identifier in self.player_rooms:
+      return 0
 
-    return card_total
+    return self._call_player_room(identifier, 'get_player_card_total', count_only_first)
 
-  def determine_winners(self):
-    is_all_locked = True
+  @operation
+  def get_player_hand(self, identifier):
+    if not identifier in self.player_rooms:
+      return None
 
-    # reset the flag
-    self.is_new_game_requested = False
+    return self._call_player_room(identifier, 'get_player_hand')
 
-    scores_dict = {}
-    for identifier, state in self.states.items():
-      if state['hand_locked'] is False:
-        is_all_locked = False
-        break
+  @operation
+  def get_player_odds(self, identifier, stand_on=None):
+    if not identifier in self.player_rooms:
+      return None
 
-      card_total = self.get_player_card_total(identifier, False)
+    return self._get_player_room(identifier).get_player_odds(identifier, stand_on)
 
-      tmp_score = self.winning_number - card_total
+  @operation
+  def determine_winners(self, room_id):
+    return self._call_room(room_id, 'determine_winners')
 
-      # store identifiers and scores which is greater than or equal to 0
-      if tmp_score >= 0:
-        scores_dict[identifier] = tmp_score
+  @operation
+  def lock_hand(self, identifier, lock=True):
+    if identifier in self.player_rooms:
+      self._call_player_room(identifier, 'lock_hand', lock)
 
-    # before we determine the actual winner, all states must be hand_locked!
-    if is_all_locked is False:
-      return None
+  @operation
+  def lock_game(self, room_id, lock=True):
+    self._call_room(room_id, 'lock_game', lock)
 
-    min_val = 0
+  @operation
+  def make_ready(self, identifier, ready=True):
+    if identifier in self.player_rooms:
+      self._call_player_room(identifier, 'make_ready', ready)
 
-    if len(scores_dict) > 0:
-      min_val = min(scores_dict.values())
+  @operation
+  def is_room_ready(self, room_id):
+    return self._call_room(room_id, 'is_room_ready')
 
-    winners = []
-    matching_score = 0
-    for f_identifier, score in scores_dict.items():
-      if score == min_val:
-        winners.append(strip_uid(f_identifier))
-        matching_score = self.get_player_card_total(f_identifier, False)
+  @operation
+  def player_count(self, room_id):
+    return self._call_room(room_id, 'player_count')
 
-    # recreate the deck to prevent error from getting no cards
-    if self.deck.get_remaining_cards() <= 15 and self.is_deck_refreshed is False:
-      self.init_deck()
+  @operation
+  def player_ready_count(self, room_id):
+    return self._call_room(room_id, 'player_ready_count')
 
-      # set the flag to true to indicate that the deck has been refreshed
-      self.is_deck_refreshed = True
+  @operation
+  def get_player_uids(self, room_id):
+    return self._call_room(room_id, 'get_player_uids')
 
-      if self.logger != None:
-        self.logger.log('new_game', "Creating new  and shuffling the deck.")
+  @operation
+  def execute(self, batch):
+    operations = []
 
-    return {
-      'winners': winners,
-      'score': matching_score
-    }
+    if not isinstance(batch, (list, tuple)):
+      return self._batch_error([], 0, None, "Batch should be a list of operations.")
 
-  def lock_hand(self, identifier, lock=True):
-    if identifier in self.states:
-      self.states[identifier]['hand_locked'] = lock
+    # the whole batch is validated before anything is run
+    for index, operation in enumerate(batch):
+      if not isinstance(operation, dict) or not 'method' in operation:
+        return self._batch_error([], index, None, "Operation should be a dictionary with a method.")
 
-  def lock_game(self, lock=True):
-    self.room_locked = lock
+      method = operation['method']
+      args = operation.get('args', [])
+      kwargs = operation.get('kwargs', {})
 
-  def make_ready(self, identifier, ready=True):
-    if identifier in self.states:
-      self.states[identifier]['is_ready'] = ready
+      if not method in BATCH_PLAYER_METHODS and not method in BATCH_ROOM_METHODS:
+        return self._batch_error([], index, method, "Method: %s can't be used in a batch." % method)
 
-  def is_room_ready(self):
-    player_ready_count = self.player_ready_count()
+      if not isinstance(args, (list, tuple)):
+        return self._batch_error([], index, method, "Arguments of method: %s should be a list." % method)
 
-    if player_ready_count > 1:
-      return True
+      if not isinstance(kwargs, dict):
+        return self._batch_error([], index, method, "Keyword arguments of method: %s should be a dictionary." % method)
 
-    return False
+      args = list(args)
 
-  def player_count(self):
-    return len(self.states)
+      if len(args) == 0:
+        return self._batch_error([], index, method, "Method: %s needs a player uid or room id." % method)
 
-  def player_ready_count(self):
-    counter = 0
+      operations.append((method, args, kwargs))
 
-    for _, state in self.states.items():
-      if state['is_ready'] is True:
-        counter += 1
+    # lock every room touched by the batch. Rooms are locked in order to prevent deadlocks
+    rooms = {}
 
-    return counter
+    for method, args, _ in operations:
+      room_id = args[0]
 
-  def get_player_uids(self):
-    identifiter_list = []
+      if method in BATCH_PLAYER_METHODS:
+        room_id = self.player_rooms.get(args[0])
 
-    for identifier, _ in self.states.items():
-      identifiter_list.append(identifier)
+      if room_id in self.rooms:
+        rooms[room_id] = self.rooms[room_id]
 
-    return identifiter_list
+    locked_rooms = [rooms[room_id] for room_id in sorted(rooms)]
 
-  def disconnect(self, identifier):
-    if identifier in self.states:
-      del self.states[identifier]
+    for room in locked_rooms:
+      room.lock.acquire()
+
+    try:
+      results = []
+
+      # stop at the first failing operation. Operations before it stay applied
+      for index, (method, args, kwargs) in enumerate(operations):
+        try:
+          # the operations are counted and traced as part of the batch, not as calls of their own
+          results.append(inspect.unwrap(getattr(Manager, method))(self, *args, **kwargs))
+        except Exception as error:
+          return self._batch_error(results, index, method, getattr(error, 'message', str(error)), error)
+
+      return {
+        'results': results,
+        'error': None
+      }
+    finally:
+      for room in reversed(locked_rooms):
+        room.lock.release()
+
+  def _batch_error(self, results, index, method, message, error=None):
+    return {
+      'results': results,
+      'error': {
+        'index': index,
+        'method': method,
+        'type': 'GameError' if error is None else type(error).__name__,
+        'message': message
+      }
+    }
+
+  def get_metrics(self):
+    return self.metrics.collect()
 
-      if self.logger != None:
-        self.logger.log("Player left: %s" % identifier, self.states)
+  def get_trace_events(self):
+    # spans recorded by the server as chrome trace events. Empty unless tracing is enabled
+    if tracer.enabled is False:
+      return []
 
-      return True
+    return tracer.get_events()
 
-    return False
+  @operation
+  def disconnect(self, identifier):
+    with self.registry_lock:
+      room_id = self.player_rooms.pop(identifier, None)
+
+    room = self.rooms.get(room_id)
 
-  def connect(self, name):
-    if self.room_locked is True:
-      if self.logger != None:
-        self.logger.log("connect", "Player: %s is trying to connect a locked game." % name)
+    if room is None:
       return False
 
-    key = name + ':uid-' + rand_uid(10)
+    with room.lock:
+      disconnected = room.disconnect(identifier)
 
-    self.states[key] = {
-      'games_played': 0,
-      'total_wins': 0,
-      'total_losses': 0,
-      'is_ready': False,
-      'hand_locked': False
-    }
+    # remove empty rooms to free their shoes. A player may have joined in the meantime
+    with self.registry_lock:
+      with room.lock:
+        if room.player_count() == 0 and self.rooms.get(room_id) is room:
+          del self.rooms[room_id]
 
-    if self.logger != None:
-      self.logger.log("Player Joined: %s" % key, self.states[key])
+          if self.logger != None:
+            self.logger.info("disconnect", "Room: %s removed.", room_id)
+
+    return disconnected
+
+  @operation
+  def connect(self, name, room_id=None, ready=False):
+    # the registry stays locked until the player is seated so that the room is not
+    # removed or filled up by another player in the meantime
+    with self.registry_lock:
+      room = None
+
+      if room_id is not None:
+        room = self._get_room(room_id)
+      else:
+        # join the first room that is still waiting for players
+        for candidate in self.rooms.values():
+          if candidate.is_joinable():
+            room = candidate
+            break
+
+        if room is None:
+          room = self._create_room()
 
-    return key
+      if room is None:
+        if self.logger != None:
+          self.logger.warning("connect", "Player: %s can't join. All rooms are taken.", name)
 
+        return False
 
+      with room.lock:
+        key = room.connect(name, ready)
+
+      if key is False:
+        return False
+
+      self.player_rooms[key] = room.room_id
+
+    return {
+      'connection_uid': key,
+      'room_id': room.room_id
+    }
@@ -0,0 +1,162 @@
+# odds.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import threading
+from collections import OrderedDict
+from app.blackjack.game.hand import compute_total
+from app.blackjack.game.error import GameError
+
+# blackjack goal number
+WINNING_NUMBER = 21
+
+class TranspositionTable(object):
+  """Bounded memo of computed positions. The least recently used entries are evicted first."""
+
+  def __init__(self, max_entries=100000):
+    if max_entries < 1:
+      raise GameError("Transposition table needs room for at least 1 entry.")
+
+    self.max_entries = max_entries
+    self.entries = OrderedDict()
+    self.lock = threading.Lock()
+
+    # lookup statistics
+    self.hits = 0
+    self.misses = 0
+
+  def get(self, key):
+    with self.lock:
+      value = self.entries.get(key)
+
+      if value is None:
+        self.misses += 1
+      else:
+        self.hits += 1
+        self.entries.move_to_end(key)
+
+      return value
+
+  def put(self, key, value):
+    with self.lock:
+      self.entries[key] = value
+      self.entries.move_to_end(key)
+
+      # evict the least recently used entries
+      while len(self.entries) > self.max_entries:
+        self.entries.popitem(last=False)
+
+  def clear(self):
+    with self.lock:
+      self.entries.clear()
+      self.hits = 0
+      self.misses = 0
+
+  def get_stats(self):
+    return {
+      'entries': len(self.entries),
+      'max_entries': self.max_entries,
+      'hits': self.hits,
+      'misses': self.misses
+    }
+
+class OddsCalculator(object):
+  """Exact outcome probabilities of a hand given the remaining deck composition.
+
+  A deck composition is a tuple with the number of remaining cards per rank as
+  returned by Deck.get_composition().
+  """
+
+  def __init__(self, stand_on=17, max_entries=100000):
+    self.stand_on = self.check_stand_on(stand_on)
+    self.table = TranspositionTable(max_entries)
+
+  def check_stand_on(self, stand_on):
+    # bounds the depth of the search. Larger values take minutes and flood the shared table
+    if not isinstance(stand_on, int) or isinstance(stand_on, bool) or stand_on < 1 or stand_on > WINNING_NUMBER:
+      raise GameError("Stand on value must be between 1 and %d." % WINNING_NUMBER)
+
+    return stand_on
+
+  def bust_probability(self, card_total, ace_count, composition):
+    remaining = sum(composition)
+
+    if remaining == 0:
+      return 0.0
+
+    busting = 0
+
+    for rank_idx, count in enumerate(composition):
+      if count == 0:
+        continue
+
+      if rank_idx == 0:
+        total = compute_total(card_total, ace_count + 1)
+      else:
+        total = compute_total(card_total + rank_idx + 1, ace_count)
+
+      if total > WINNING_NUMBER:
+        busting += count
+
+    return busting / remaining
+
+  def final_total_distribution(self, card_total, ace_count, composition, stand_on=None):
+    if stand_on is None:
+      stand_on = self.stand_on
+    else:
+      self.check_stand_on(stand_on)
+
+    return dict(self._resolve(card_total, ace_count, tuple(composition), stand_on))
+
+  def get_odds(self, card_total, ace_count, composition, stand_on=None):
+    distribution = self.final_total_distribution(card_total, ace_count, composition, stand_on)
+
+    return {
+      'bust_probability': self.bust_probability(card_total, ace_count, composition),
+      'final_bust_probability': sum(probability for total, probability in distribution.items()
+                                    if total > WINNING_NUMBER),
+
+      # list of [total, probability] pairs since not all serializers allow integer keys
+      'totals': [[total, distribution[total]] for total in sorted(distribution)]
+    }
+
+  def _resolve(self, card_total, ace_count, composition, stand_on):
+    total = compute_total(card_total, ace_count)
+    remaining = sum(composition)
+
+    # stop drawing once the player stands or no cards are left
+    if total >= stand_on or remaining == 0:
+      return ((total, 1.0),)
+
+    key = (composition, card_total, ace_count, stand_on)
+    cached = self.table.get(key)
+
+    if cached is not None:
+      return cached
+
+    distribution = {}
+
+    for rank_idx, count in enumerate(composition):
+      if count == 0:
+        continue
+
+      probability = count / remaining
+
+      # take the card out of the deck
+      next_composition = composition[:rank_idx] + (count - 1,) + composition[rank_idx + 1:]
+
+      if rank_idx == 0:
+        outcomes = self._resolve(card_total, ace_count + 1, next_composition, stand_on)
+      else:
+        outcomes = self._resolve(card_total + rank_idx + 1, ace_count, next_composition, stand_on)
+
+      for final_total, final_probability in outcomes:
+        distribution[final_total] = distribution.get(final_total, 0.0) + probability * final_probability
+
+    resolved = tuple(distribution.items())
+
+    self.table.put(key, resolved)
+
+    return resolved
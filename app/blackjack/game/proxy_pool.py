@@ -0,0 +1,103 @@
+# proxy_pool.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import threading
+from Pyro4.core import Proxy as PyroProxy
+from app.tracing import tracer, encode_context, TRACE_ANNOTATION
+
+# proxies kept for threads that are started later. Their connections are closed
+MAX_IDLE_PROXIES = 4
+
+class TracedProxy(PyroProxy):
+  """Pyro proxy that records each call as a span and sends the trace context to the server."""
+
+  def _pyroInvoke(self, methodname, *args, **kwargs):
+    if tracer.enabled is False:
+      return PyroProxy._pyroInvoke(self, methodname, *args, **kwargs)
+
+    with tracer.span("call %s" % methodname, 'network'):
+      return PyroProxy._pyroInvoke(self, methodname, *args, **kwargs)
+
+  def _pyroAnnotations(self):
+    annotations = PyroProxy._pyroAnnotations(self)
+    context = tracer.current()
+
+    # the server continues the trace of the span of this call
+    if context is not None:
+      annotations[TRACE_ANNOTATION] = encode_context(context)
+
+    return annotations
+
+class ProxyPool(object):
+  """Pyro proxies of the game manager. Each thread uses its own proxy and connection."""
+
+  def __init__(self, uri, max_idle=MAX_IDLE_PROXIES):
+    self.uri = uri
+    self.max_idle = max_idle
+
+    # proxies that are not used by any thread
+    self.idle = []
+    self.lock = threading.Lock()
+
+    # proxy used by the current thread
+    self.local = threading.local()
+
+  def get(self):
+    proxy = getattr(self.local, 'proxy', None)
+
+    # the proxy is only taken from the pool on the first call of the thread
+    if proxy is None:
+      proxy = self.checkout()
+      self.local.proxy = proxy
+
+    return proxy
+
+  def checkout(self):
+    proxy = None
+
+    with self.lock:
+      if len(self.idle) > 0:
+        proxy = self.idle.pop()
+
+    if proxy is None:
+      return TracedProxy(self.uri)
+
+    # newer pyro versions only let the thread that owns the proxy use it
+    if hasattr(proxy, '_pyroClaimOwnership'):
+      proxy._pyroClaimOwnership()
+
+    return proxy
+
+  def checkin(self, proxy):
+    # an open connection holds a worker thread of the pyro "thread" server, so idle proxies
+    # are disconnected. They connect again on their next call
+    proxy._pyroRelease()
+
+    with self.lock:
+      if len(self.idle) < self.max_idle:
+        self.idle.append(proxy)
+
+  def release(self):
+    # the current thread is done with the proxy, keep it for the next thread
+    proxy = getattr(self.local, 'proxy', None)
+
+    if proxy is not None:
+      self.local.proxy = None
+      self.checkin(proxy)
+
+  def discard(self):
+    # the connection of the current thread is broken. The next call connects a new proxy
+    proxy = getattr(self.local, 'proxy', None)
+
+    if proxy is not None:
+      self.local.proxy = None
+      proxy._pyroRelease()
+
+  def close(self):
+    with self.lock:
+      self.idle = []
+
+    self.discard()
@@ -0,0 +1,542 @@
+# room.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import threading
+from collections import deque
+from app.helpers import rand_uid, strip_uid
+from app.logger import DEBUG, INFO, WARNING
+from app.blackjack.cards.shoe import SerializableShoe
+from app.cards.pipeline import ShoePipeline
+from app.blackjack.cards.card import Card
+from app.blackjack.game.hand import Hand
+from app.cards.transformer import code_to_text
+
+MAX_PLAYERS = 4
+
+# the shoe is always reshuffled when the remaining cards goes down to this number
+MIN_REMAINING_CARDS = 15
+
+# number of recent events kept for clients that are waiting for changes
+EVENT_BUFFER_SIZE = 256
+
+# number of cards of the opening hands
+OPENING_CARDS = 2
+
+# longest time in seconds a client can wait for new events in one call
+MAX_EVENT_WAIT = 30
+
+# events that change the room itself and events that change every player of the room
+ROOM_EVENTS = ['player_joined', 'player_left', 'game_locked', 'round_reset', 'winners_decided']
+ROUND_EVENTS = ['round_reset', 'round_dealt']
+
+# TODO: implement logic for incrementing 'games_played', 'total_wins' and 'total_losses'
+class Room(object):
+  """Game table with its own shoe and player states."""
+
+  def __init__(self, room_id, decks=1, penetration=0.75, odds=None, shuffle_worker=None, logger=None,
+               listeners=None, metrics=None):
+    self.room_id = room_id
+
+    # the next shoe is shuffled in the background while the current one is dealt
+    self.shoes = ShoePipeline(lambda: SerializableShoe(decks, penetration), shuffle_worker)
+
+    # shoe of the game
+    self.deck = self.shoes.get_shoe()
+
+    # save state
+    self.states = {}
+
+    # running summary of the cards on hand of each player
+    self.hands = {}
+
+    # message logging
+    self.logger = logger
+
+    # boolean to determine whether a game is on going or not
+    self.room_locked = False
+
+    # boolean if new game is requested
+    self.is_new_game_requested = False
+
+    # boolean if deck newly created
+    self.is_deck_refreshed = False
+
+    # blackjack goal number
+    self.winning_number = 21
+
+    # exact odds of the hands against the remaining cards of the deck
+    self.odds = odds
+
+    # result of the current round
+    self.winners = None
+
+    # boolean if the opening hands of the current round were dealt
+    self.is_round_dealt = False
+
+    # sequenced events of the room. Waiting clients are woken up through the condition.
+    # The lock is held by the callers of the methods that read or change the states, except
+    # for the waiting, odds and snapshot methods which take care of it themselves
+    self.lock = threading.RLock()
+    self.condition = threading.Condition(self.lock)
+    self.events = deque(maxlen=EVENT_BUFFER_SIZE)
+    self.event_seq = 0
+
+    # the event sequence number doubles as the version of the table. These keep the
+    # version of the last change of the room, of each player and of each departure
+    self.room_version = 0
+    self.player_versions = {}
+    self.departures = {}
+
+    # latest published view of the table for snapshot queries
+    self.publish_table()
+
+    # called with the room id and each published event. Listeners run with the room
+    # locked so they should only hand the event over
+    self.listeners = listeners if listeners is not None else []
+
+    # counters of the game, shared by the rooms of a manager
+    self.metrics = metrics
+
+  def publish(self, event_type, **data):
+    with self.condition:
+      self.event_seq += 1
+
+      self.events.append({
+        'seq': self.event_seq,
+        'type': event_type,
+        'data': data
+      })
+
+      # stamp the parts of the table changed by the event
+      if event_type in ROOM_EVENTS:
+        self.room_version = self.event_seq
+
+      if event_type in ROUND_EVENTS:
+        for identifier in self.states:
+          self.player_versions[identifier] = self.event_seq
+
+      if 'uid' in data:
+        if data['uid'] in self.states:
+          self.player_versions[data['uid']] = self.event_seq
+        else:
+          self.player_versions.pop(data['uid'], None)
+          self.departures[data['uid']] = self.event_seq
+
+      self.publish_table()
+
+      self.condition.notify_all()
+
+      for listener in self.listeners:
+        listener(self.room_id, self.events[-1])
+
+  def publish_table(self):
+    # changes older than the buffered events are no longer tracked
+    horizon = self.events[0]['seq'] - 1 if len(self.events) > 0 else self.event_seq
+
+    # forget departures that can no longer be asked for
+    for identifier, version in list(self.departures.items()):
+      if version <= horizon:
+        del self.departures[identifier]
+
+    players = {}
+
+    for identifier, state in self.states.items():
+      hand = self.hands[identifier]
+
+      players[identifier] = {
+        'version': self.player_versions.get(identifier, 0),
+        'view': {
+          'cards': list(state.get('cards_on_hand', [])),
+          'total': hand.get_total(),
+          'first_card_total': hand.get_total(True),
+          'is_ready': state['is_ready'],
+          'hand_locked': state['hand_locked']
+        }
+      }
+
+    # the published table is never modified. Readers take the reference without locking
+    # and a new table replaces it on every change
+    self.table = {
+      'version': self.event_seq,
+      'horizon': horizon,
+      'room_version': self.room_version,
+      'room': {
+        'room_id': self.room_id,
+        'is_locked': self.room_locked,
+        'player_uids': self.get_player_uids(),
+        'winners': self.winners
+      },
+      'players': players,
+      'departures': dict(self.departures)
+    }
+
+  def get_event_seq(self):
+    return self.event_seq
+
+  def wait_for_events(self, since_seq=0, timeout=MAX_EVENT_WAIT):
+    timeout = max(0, min(timeout, MAX_EVENT_WAIT))
+
+    with self.condition:
+      self.condition.wait_for(lambda: self.event_seq > since_seq, timeout)
+
+      events = [event for event in self.events if event['seq'] > since_seq]
+
+      # the client has to reload the state of the room when older events were dropped from the buffer
+      missed = self.event_seq > since_seq and (len(events) == 0 or events[0]['seq'] > since_seq + 1)
+
+      return {
+        'seq': self.event_seq,
+        'events': events,
+        'missed': missed,
+        'player_count': self.player_count(),
+        'ready_count': self.player_ready_count()
+      }
+
+  def get_table_snapshot(self, since_version=0):
+    table = self.table
+
+    # a full snapshot is sent when the changes since the version are no longer tracked
+    is_full = since_version <= 0 or since_version < table['horizon'] or since_version > table['version']
+
+    snapshot = {
+      'version': table['version'],
+      'is_full': is_full,
+      'players': {},
+      'removed': []
+    }
+
+    if is_full or table['room_version'] > since_version:
+      snapshot['room'] = table['room']
+
+    for identifier, player in table['players'].items():
+      if is_full or player['version'] > since_version:
+        snapshot['players'][identifier] = player['view']
+
+    if not is_full:
+      for identifier, version in table['departures'].items():
+        if version > since_version:
+          snapshot['removed'].append(identifier)
+
+    return snapshot
+
+  def log(self, label, message, *args, level=DEBUG, **fields):
+    if self.logger != None:
+      self.logger.log(label, message, *args, level=level, room=self.room_id, **fields)
+
+  def get_states(self):
+    # copied since the result is serialized after the room is unlocked
+    states = {}
+
+    for identifier, state in self.states.items():
+      states[identifier] = dict(state)
+
+      if 'cards_on_hand' in state:
+        states[identifier]['cards_on_hand'] = list(state['cards_on_hand'])
+
+    return states
+
+  def init_deck(self):
+    # swap in the shoe that has been shuffled ahead of time
+    self.deck = self.shoes.swap()
+
+    if self.metrics is not None:
+      self.metrics.increment('deck_refreshes')
+
+  def new_game(self, identifier):
+    if self.is_new_game_requested is False:
+      for _, state in self.states.items():
+        # make sure player is not ready
+        state['is_ready'] = False
+
+      # set back to false to allow deck refresh
+      self.is_deck_refreshed = False
+
+      # set to true to prevent executing this block on next call
+      self.is_new_game_requested = True
+
+      # clear the result of the previous round
+      self.winners = None
+
+      # allow the next round to be dealt
+      self.is_round_dealt = False
+
+      self.publish('round_reset')
+
+    # increment the number of games played
+    self.states[identifier]['games_played'] += 1
+
+    # unlock hand
+    self.states[identifier]['hand_locked'] = False
+
+    # empty the cards on hand
+    self.states[identifier]['cards_on_hand'] = []
+    self.hands[identifier].clear()
+
+    self.log('new_game', "Starting a new game.")
+
+    self.publish('new_game', uid=identifier)
+
+  # TODO: throw error when number_of_cards is less than 1
+  def draw_cards(self, identifier, number_of_cards=2):
+    drawn_cards = []
+
+    # do not invoke pluck when hand is locked
+    if self.states[identifier]['hand_locked'] is False:
+      drawn_cards = self.deck.pluck(number_of_cards)
+
+    if identifier in self.states and not 'cards_on_hand' in self.states[identifier]:
+      self.states[identifier]['cards_on_hand'] = []
+
+    if identifier in self.states:
+      hand = self.hands[identifier]
+
+      for card in drawn_cards:
+        self.states[identifier]['cards_on_hand'].append(card)
+        hand.add(Card.from_code(card))
+
+      self.log('draw_cards', "Player %s drew %s", identifier, drawn_cards)
+
+    self.log('draw_cards', "Remaining cards: %d", self.deck.get_remaining_cards())
+
+    if len(drawn_cards) > 0:
+      self.publish('cards_drawn', uid=identifier, cards=drawn_cards)
+
+    return drawn_cards
+
+  def deal_round(self):
+    # only the first call of a round deals, the rest get the hands that were dealt
+    if self.is_round_dealt is False:
+      players = [identifier for identifier, state in self.states.items()
+                 if state['is_ready'] is True and state['hand_locked'] is False]
+
+      # swap in a fresh shoe instead of running out in the middle of the deal
+      if self.deck.get_remaining_cards() < len(players) * OPENING_CARDS:
+        self.init_deck()
+
+      for identifier in players:
+        if not 'cards_on_hand' in self.states[identifier]:
+          self.states[identifier]['cards_on_hand'] = []
+
+      # one card to each player at a time like a dealer would
+      for _ in range(0, OPENING_CARDS):
+        for identifier in players:
+          card = self.deck.pluck(1)[0]
+
+          self.states[identifier]['cards_on_hand'].append(card)
+          self.hands[identifier].add(Card.from_code(card))
+
+      self.is_round_dealt = True
+
+      self.log('deal_round', "Remaining cards: %d", self.deck.get_remaining_cards())
+
+      self.publish('round_dealt', hands={identifier: list(self.states[identifier]['cards_on_hand'])
+                                         for identifier in players})
+
+    result = {
+      'hands': {},
+      'totals': {}
+    }
+
+    for identifier, state in self.states.items():
+      result['hands'][identifier] = list(state.get('cards_on_hand', []))
+      result['totals'][identifier] = self.hands[identifier].get_total()
+
+    return result
+
+  def get_player_cards(self, exclude_uids=None, as_text=False):
+    result = {}
+
+    for identifier, state in self.states.items():
+      # skip to the next iteration when the identifier needs to be excluded
+      if exclude_uids is not None and identifier in exclude_uids:
+        continue
+
+      on_hand = []
+
+      if 'cards_on_hand' in state:
+        on_hand = list(state['cards_on_hand'])
+
+      # text form of the cards is only used for debugging and older clients
+      if as_text is True:
+        on_hand = [code_to_text(card) for card in on_hand]
+
+      result[identifier] = on_hand
+
+    return result
+
+  def get_player_card_total(self, identifier, count_only_first=False):
+    if identifier in self.hands:
+      return self.hands[identifier].get_total(count_only_first)
+
+    return 0
+
+  def get_player_hand(self, identifier):
+    if identifier in self.hands:
+      return self.hands[identifier].get_summary()
+
+    return None
+
+  def get_player_odds(self, identifier, stand_on=None):
+    # only the position is read under the lock. The odds can take a while to compute
+    with self.lock:
+      if not identifier in self.hands or self.odds is None:
+        return None
+
+      hand = self.hands[identifier]
+      card_total, ace_count, composition = hand.card_total, hand.ace_count, self.deck.get_composition()
+
+    return self.odds.get_odds(card_total, ace_count, composition, stand_on)
+
+  def is_all_locked(self):
+    for _, state in self.states.items():
+      if state['hand_locked'] is False:
+        return False
+
+    return len(self.states) > 0
+
+  def determine_winners(self):
+    # the round is resolved as soon as the last hand is locked
+    if self.winners is None and self.is_all_locked():
+      self.resolve_round()
+
+    return self.winners
+
+  def resolve_round(self):
+    # reset the flag
+    self.is_new_game_requested = False
+
+    scores_dict = {}
+    for identifier, hand in self.hands.items():
+      card_total = hand.get_total()
+
+      tmp_score = self.winning_number - card_total
+
+      # store identifiers and scores which is greater than or equal to 0
+      if tmp_score >= 0:
+        scores_dict[identifier] = tmp_score
+
+    min_val = 0
+
+    if len(scores_dict) > 0:
+      min_val = min(scores_dict.values())
+
+    winners = []
+    matching_score = 0
+    for f_identifier, score in scores_dict.items():
+      if score == min_val:
+        winners.append(strip_uid(f_identifier))
+        matching_score = self.hands[f_identifier].get_total()
+
+    # reshuffle the shoe once the cut card is reached to prevent error from getting no cards
+    needs_reshuffle = self.deck.needs_reshuffle() or self.deck.get_remaining_cards() <= MIN_REMAINING_CARDS
+
+    if needs_reshuffle and self.is_deck_refreshed is False:
+      self.init_deck()
+
+      # set the flag to true to indicate that the deck has been refreshed
+      self.is_deck_refreshed = True
+
+      self.log('new_game', "Reshuffling the shoe.", level=INFO)
+
+    self.winners = {
+      'winners': winners,
+      'score': matching_score
+    }
+
+    if self.metrics is not None:
+      self.metrics.increment('rounds_completed')
+
+    self.publish('winners_decided', **self.winners)
+
+  def lock_hand(self, identifier, lock=True):
+    if identifier in self.states:
+      self.states[identifier]['hand_locked'] = lock
+
+      self.publish('hand_locked', uid=identifier, hand_locked=lock)
+
+      # before we determine the actual winner, all states must be hand_locked!
+      self.determine_winners()
+
+  def lock_game(self, lock=True):
+    self.room_locked = lock
+
+    self.publish('game_locked', is_locked=lock)
+
+  def make_ready(self, identifier, ready=True):
+    if identifier in self.states:
+      self.states[identifier]['is_ready'] = ready
+
+      self.publish('player_ready', uid=identifier, is_ready=ready)
+
+  def is_room_ready(self):
+    player_ready_count = self.player_ready_count()
+
+    if player_ready_count > 1:
+      return True
+
+    return False
+
+  def is_joinable(self):
+    return self.room_locked is False and len(self.states) < MAX_PLAYERS
+
+  def player_count(self):
+    return len(self.states)
+
+  def player_ready_count(self):
+    counter = 0
+
+    for _, state in self.states.items():
+      if state['is_ready'] is True:
+        counter += 1
+
+    return counter
+
+  def get_player_uids(self):
+    identifiter_list = []
+
+    for identifier, _ in self.states.items():
+      identifiter_list.append(identifier)
+
+    return identifiter_list
+
+  def disconnect(self, identifier):
+    if identifier in self.states:
+      del self.states[identifier]
+      del self.hands[identifier]
+
+      self.log('disconnect', "Player %s left. Remaining players: %d", identifier, len(self.states), level=INFO)
+
+      self.publish('player_left', uid=identifier)
+
+      # the player that left may be the last one the others were waiting for
+      self.determine_winners()
+
+      return True
+
+    return False
+
+  def connect(self, name, ready=False):
+    if self.is_joinable() is False:
+      self.log('connect', "Player: %s is trying to connect a locked or full game.", name, level=WARNING)
+      return False
+
+    key = name + ':uid-' + rand_uid(10)
+
+    self.states[key] = {
+      'games_played': 0,
+      'total_wins': 0,
+      'total_losses': 0,
+      'is_ready': ready,
+      'hand_locked': False
+    }
+
+    self.hands[key] = Hand()
+
+    self.log('connect', "Player %s joined. Ready: %s", key, ready, level=INFO)
+
+    self.publish('player_joined', uid=key)
+
+    return key
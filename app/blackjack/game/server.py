@@ -7,22 +7,46 @@
 # from app.blackjack.cards.deck import SerializableDeck
 from app.blackjack.game.manager import Manager
 # from app.cards.deck import Deck
+from app.blackjack.game.error import GameError
 from Pyro4.core import Daemon as PyroDaemon
+import Pyro4
+
+# pyro server types. The single threaded "multiplex" server is not supported since a client
+# waiting for room events would stall every other call, including the one publishing the event
+SERVER_TYPES = ['thread']
+
+# wire formats the server can be configured with. msgpack needs the msgpack package
+SERIALIZERS = ['serpent', 'json', 'marshal', 'msgpack']
 
 class Server(object):
 
-  def __init__(self):
+  def __init__(self, game_manager=None):
     # initialize game manager
-    self.game_manager = Manager()
+    if game_manager is None:
+      game_manager = Manager()
+
+    self.game_manager = game_manager
 
     # store connection details
     self.server_host = "localhost"
     self.server_port = 3000
 
+    # pyro server settings. Every connected client holds a worker thread of the pool
+    self.server_type = "thread"
+    self.threadpool_size = 40
+
+    # clients have to use the same serializer
+    self.serializer = "serpent"
+
   def start(self, managerlabel=None):
     if managerlabel is None:
       managerlabel = "standard.manager"
 
+    # must be set before the daemon is created
+    Pyro4.config.SERVERTYPE = self.server_type
+    Pyro4.config.THREADPOOL_SIZE = self.threadpool_size
+    Pyro4.config.SERIALIZERS_ACCEPTED = set([self.serializer])
+
     PyroDaemon.serveSimple({
       self.game_manager: managerlabel
     }, ns=False, host=self.server_host, port=self.server_port)
@@ -45,4 +69,32 @@ class Server(object):
   def set_port(self, port: int):
     self.server_port = port
 
+  def get_server_type(self):
+    return self.server_type
+
+  def set_server_type(self, server_type: str):
+    if server_type == "multiplex":
+      raise GameError("Server type: multiplex can't serve clients waiting for room events. Use thread.")
+
+    if not server_type in SERVER_TYPES:
+      raise GameError("Server type should be one of: %s" % ', '.join(SERVER_TYPES))
+
+    self.server_type = server_type
+
+  def get_threadpool_size(self):
+    return self.threadpool_size
+
+  def set_threadpool_size(self, threadpool_size: int):
+    if not isinstance(threadpool_size, int) or threadpool_size < 1:
+      raise GameError("Thread pool size should be an integer greater than 0.")
+
+    self.threadpool_size = threadpool_size
+
+  def get_serializer(self):
+    return self.serializer
+
+  def set_serializer(self, serializer: str):
+    if not serializer in SERIALIZERS:
+      raise GameError("Serializer should be one of: %s" % ', '.join(SERIALIZERS))
 
+    self.serializer = serializer
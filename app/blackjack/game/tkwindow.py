@@ -12,17 +12,21 @@ import tkinter as pygui
 from tkinter import messagebox
 from PIL import Image, ImageTk
 from app.helpers import strip_uid
-from app.cards.transformer import CardToCardImagePositionTransformer, BLANK_COORDS, CARD_WIDTH
+from app.cards.sprite import CardToCardImagePositionTransformer, BLANK_COORDS, get_card_width
 from app.blackjack.game.error import GameError
-from app.blackjack.cards.transformer import TextToCardTransformer
+from app.blackjack.cards.transformer import CodeToCardTransformer
 from app.blackjack.cards.deck import SerializableDeck
 from Pyro4.errors import SerializeError, CommunicationError
-from Pyro4.core import Proxy as PyroProxy
+from app.blackjack.game.proxy_pool import ProxyPool
+from app.tracing import traced
 from Pyro4.util import getPyroTraceback as PyroExceptionTraceback, excepthook as PyroExceptHook
 
 # add hooks to exception hooks
 sys.excepthook = PyroExceptHook
 
+# seconds each call waits for room events. Listener threads check their stop event in between
+EVENT_WAIT = 5
+
 class Window(object):
 
   def __init__(self, window_title="BlackJack"):
@@ -41,8 +45,8 @@ class Window(object):
     # blackjack goal number
     self.winning_number = 21
 
-    # Game Manager
-    self.game_manager = None
+    # Game Manager proxies. The main thread and every game thread use their own proxy
+    self.proxies = None
 
     # Game State storage
     self.game_storage = {}
@@ -64,13 +68,18 @@ class Window(object):
     self.main_gui_items = {}
     # [Main GUI Init] ::end
 
+  @property
+  def game_manager(self):
+    # proxy of the calling thread
+    return self.proxies.get()
+
   def bootstrap(self):
-    if self.game_manager is None:
+    if self.proxies is None:
       if self.logger != None:
-        self.logger.log('Bootstrap',
+        self.logger.warning('Bootstrap',
                         "No custom game manager connection provided. Establishing connection with default parameters.")
 
-      self.game_manager = PyroProxy("PYRO:standard.manager@localhost:3000")
+      self.proxies = ProxyPool("PYRO:standard.manager@localhost:3000")
 
     # set window title
     self.window.wm_title(self.window_title)
@@ -87,9 +96,11 @@ class Window(object):
     # Start the GUI
     self.window.mainloop()
 
+  @traced('ui')
   def hit(self):
     try:
-      card_total = self.game_manager.get_player_card_total(self.game_storage['connection_uid'])
+      # the total of the hand is known since the score was last rendered
+      card_total = self.game_storage.get('card_total', 0)
 
       # show popup box to indicate that the score is already 21 or above
       # and succeeding call to `self.hit()` is not allowed
@@ -100,13 +111,21 @@ class Window(object):
 
         return
 
-      # get 1 new card
-      new_card = self.game_manager.draw_cards(self.game_storage['connection_uid'], 1)
+      # get 1 new card and the new card total in a single round trip
+      response = self.game_manager.execute([
+        {'method': 'draw_cards', 'args': [self.game_storage['connection_uid'], 1]},
+        {'method': 'get_player_card_total', 'args': [self.game_storage['connection_uid']]}
+      ])
+
+      if response['error'] is not None:
+        if self.logger != None:
+          self.logger.warning("hit", response['error']['message'])
+
+        return
 
-      self.draw_cards_on_canvas(self.game_storage['connection_uid'], new_card, False)
+      new_card, card_total = response['results']
 
-      # get the new card total after getting new card and rendering it in the canvas
-      card_total = self.game_manager.get_player_card_total(self.game_storage['connection_uid'])
+      self.draw_cards_on_canvas(self.game_storage['connection_uid'], new_card, False, card_total)
 
       # call `self.stand()` when the card total is greater than or equal to 21
       if card_total >= self.winning_number:
@@ -114,12 +133,23 @@ class Window(object):
 
     except SerializeError:
       if self.logger != None:
-        self.logger.log("Pyro traceback", "".join(PyroExceptionTraceback()))
+        self.logger.error("Pyro traceback", "".join(PyroExceptionTraceback()))
 
+  @traced('ui')
   def stand(self):
     try:
-      # lock cards in hand to prevent any modification
-      self.game_manager.lock_hand(self.game_storage['connection_uid'], True)
+      # lock cards in hand to prevent any modification. The event sequence is read first so
+      # that the listener sees the winners being decided
+      response = self.game_manager.execute([
+        {'method': 'get_event_seq', 'args': [self.game_storage['room_id']]},
+        {'method': 'lock_hand', 'args': [self.game_storage['connection_uid'], True]}
+      ])
+
+      if response['error'] is not None:
+        if self.logger != None:
+          self.logger.warning("stand", response['error']['message'])
+
+        return
 
       # Disable hit and stand buttons
       self.main_gui_items['stand_btn'].config(state=pygui.DISABLED)
@@ -131,9 +161,10 @@ class Window(object):
       self.game_threads['winner_declaration_listener']['evt'] = threading.Event()
       self.game_threads['winner_declaration_listener']['thread'] = threading.Thread(
         name="winner_declaration_listener_thread",
-        target=self.find_winners,
-        args=(self.game_threads['winner_declaration_listener']['evt'], self.game_manager,),
+        target=self.run_worker,
+        args=(self.find_winners, self.game_threads['winner_declaration_listener']['evt'],),
         kwargs={
+          'since_seq': response['results'][0],
           'on_identify_winners': self.declare_winners
         }
       )
@@ -142,8 +173,9 @@ class Window(object):
       self.game_threads['winner_declaration_listener']['thread'].start()
     except SerializeError:
       if self.logger != None:
-        self.logger.log("Pyro traceback", "".join(PyroExceptionTraceback()))
+        self.logger.error("Pyro traceback", "".join(PyroExceptionTraceback()))
 
+  @traced('ui')
   def declare_winners(self, response):
     winner_message = "Player: %s has won the round with the score of %d!"
     status = ""
@@ -171,8 +203,16 @@ class Window(object):
     # clean up some resources
     self.cleanup()
 
-    # invoke new game
-    self.game_manager.new_game(self.game_storage['connection_uid'])
+    # invoke new game and send the answer in a single round trip
+    batch = [{'method': 'new_game', 'args': [self.game_storage['connection_uid']]}]
+
+    if answer is True:
+      batch.append({'method': 'make_ready', 'args': [self.game_storage['connection_uid'], True]})
+
+    response = self.game_manager.execute(batch)
+
+    if response['error'] is not None and self.logger != None:
+      self.logger.warning("declare_winners", response['error']['message'])
 
     # run thread for listening for other to acknowledge the new game
     self.game_threads['wait_for_acknowledgement'] = {}
@@ -180,8 +220,8 @@ class Window(object):
     self.game_threads['wait_for_acknowledgement']['evt'] = threading.Event()
     self.game_threads['wait_for_acknowledgement']['thread'] = threading.Thread(
       name="wait_for_acknowledgement_thread",
-      target=self.check_if_all_acknowledged,
-      args=(self.game_threads['wait_for_acknowledgement']['evt'], self.game_manager,),
+      target=self.run_worker,
+      args=(self.check_if_all_acknowledged, self.game_threads['wait_for_acknowledgement']['evt'],),
       kwargs={
         'on_acknowledge': self.init_game_session
       }
@@ -190,10 +230,8 @@ class Window(object):
     # start the listener thread
     self.game_threads['wait_for_acknowledgement']['thread'].start()
 
-    # if the user answered "OK" to the question, we start a new game session
-    if answer is True:
-      self.send_ready()
-    else:
+    # the player is already set to ready if the user answered "OK" to the question
+    if answer is not True:
       self.main_gui_items['new_game_btn'].config(state=pygui.NORMAL)
 
   def send_ready(self):
@@ -221,7 +259,7 @@ class Window(object):
     self.window.wm_title("%s - %s" % (self.window_title, strip_uid(self.game_storage['connection_uid'])))
 
     try:
-      player_uids = self.game_manager.get_player_uids()
+      player_uids = self.game_manager.get_player_uids(self.game_storage['room_id'])
 
       if len(player_uids) > 2:
         # set default window size if the number of players is greater than 2
@@ -260,7 +298,7 @@ class Window(object):
         self.main_gui_items[label_key] = self.main_gui_items[canvas_key].create_text(10, 0, anchor=pygui.NW)
         self.main_gui_items[canvas_key].itemconfig(self.main_gui_items[label_key], text=label_text)
 
-        self.logger.log(player_uid, ("Row: %d Column: %d" % (row, column)))
+        self.logger.debug(player_uid, "Row: %d Column: %d", row, column)
 
         # process grid positioning accross the frame
         tmp_idx = index + 1
@@ -314,7 +352,7 @@ class Window(object):
       self.init_game_session()
     except SerializeError:
       if self.logger != None:
-        self.logger.log("Pyro traceback", "".join(PyroExceptionTraceback()))
+        self.logger.error("Pyro traceback", "".join(PyroExceptionTraceback()))
 
   def splash_gui(self):
     if self.splash_bootstrapped is False:
@@ -344,19 +382,21 @@ class Window(object):
 
     self.splash_gui_items['splash_frame'].pack(padx=10, pady=25)
 
+  @traced('ui')
   def init_game_session(self):
     try:
 
-      # initialize cards on hand of all players
-      player_uids = self.game_manager.get_player_uids()
+      # the opening hands of the whole table are dealt by the server once per round
+      dealt = self.game_manager.deal_round(self.game_storage['room_id'])
 
-      for player_uid in player_uids:
+      # initialize cards on hand of all players
+      for player_uid in dealt['hands']:
         on_hand_key = "cards_on_hand_%s" % player_uid
         self.game_storage[on_hand_key] = []
 
-      drawn_cards = self.game_manager.draw_cards(self.game_storage['connection_uid'], 2)
+      connection_uid = self.game_storage['connection_uid']
 
-      self.draw_cards_on_canvas(self.game_storage['connection_uid'], drawn_cards, False)
+      self.draw_cards_on_canvas(connection_uid, dealt['hands'][connection_uid], False, dealt['totals'][connection_uid])
 
       # disable the new game btn
       self.main_gui_items['new_game_btn'].config(state=pygui.DISABLED)
@@ -371,8 +411,8 @@ class Window(object):
       self.game_threads['on_hand_listener']['evt'] = threading.Event()
       self.game_threads['on_hand_listener']['thread'] = threading.Thread(
         name="on_hand_listener_thread",
-        target=self.draw_player_cards,
-        args=(self.game_threads['on_hand_listener']['evt'], self.game_manager,),
+        target=self.run_worker,
+        args=(self.draw_player_cards, self.game_threads['on_hand_listener']['evt'],),
         kwargs={
           'on_hand': self.draw_cards_on_canvas,
           'excluded_uids': [
@@ -385,7 +425,7 @@ class Window(object):
       self.game_threads['on_hand_listener']['thread'].start()
     except SerializeError:
       if self.logger != None:
-        self.logger.log("Pyro traceback", "".join(PyroExceptionTraceback()))
+        self.logger.error("Pyro traceback", "".join(PyroExceptionTraceback()))
 
   def toggle_name_input(self, hide=False):
     if hide is True:
@@ -400,7 +440,7 @@ class Window(object):
       # Empty the input box
       self.splash_gui_items['name_input'].delete(0, pygui.END)
 
-  def reflect_score(self, identifier, has_hidden_card=False):
+  def reflect_score(self, identifier, has_hidden_card=False, score=None):
     resolved_label = "You"
 
     if identifier != self.game_storage['connection_uid']:
@@ -414,14 +454,23 @@ class Window(object):
     initial_score = 0
 
     try:
-      initial_score = self.game_manager.get_player_card_total(identifier, has_hidden_card)
+      # only ask the server when the score is not known yet
+      if score is None:
+        initial_score = self.game_manager.get_player_card_total(identifier, has_hidden_card)
+      else:
+        initial_score = score
     except SerializeError:
       if self.logger != None:
-        self.logger.log("Pyro traceback", "".join(PyroExceptionTraceback()))
+        self.logger.error("Pyro traceback", "".join(PyroExceptionTraceback()))
+
+    # keep the total of the own hand so that hitting does not need to ask the server first
+    if identifier == self.game_storage['connection_uid'] and has_hidden_card is False:
+      self.game_storage['card_total'] = initial_score
 
     self.main_gui_items[canvas_key].itemconfig(self.main_gui_items[label_key],
                                                text="%s: %d" % (resolved_label, initial_score))
 
+  @traced('ui')
   def connect_to_server(self):
     try:
       nameval = self.splash_gui_items['name_input'].get().strip()
@@ -430,23 +479,21 @@ class Window(object):
         messagebox.showerror(self.window_title, "Please provide your name.")
         return
 
-      # temporarily save the connection uid
-      connection_uid = self.game_manager.connect(nameval)
+      # temporarily save the connection details. The player is set to ready on the same call
+      connection = self.game_manager.connect(nameval, None, True)
 
-      # check if the game room is locked or not
-      if connection_uid is False:
-        messagebox.showerror(self.window_title, "Game already started. Cannot join a locked room.")
+      # check if there is a game room available
+      if connection is False:
+        messagebox.showerror(self.window_title, "All game rooms are taken. Try again later.")
         return
 
-      # save the connection uid
-      self.game_storage['connection_uid'] = connection_uid
+      # save the connection uid and the assigned game room
+      self.game_storage['connection_uid'] = connection['connection_uid']
+      self.game_storage['room_id'] = connection['room_id']
 
       # save the plain name
       self.game_storage['current_name'] = nameval
 
-      # set the player to ready status
-      self.game_manager.make_ready(self.game_storage['connection_uid'], True)
-
       if self.logger != None:
         self.logger.log("Connection UID", self.game_storage['connection_uid'])
 
@@ -462,8 +509,8 @@ class Window(object):
       self.game_threads['wait_for_players']['evt'] = threading.Event()
       self.game_threads['wait_for_players']['thread'] = threading.Thread(
         name="wait_for_players_thread",
-        target=self.check_if_ready,
-        args=(self.game_threads['wait_for_players']['evt'], self.game_manager,),
+        target=self.run_worker,
+        args=(self.check_if_ready, self.game_threads['wait_for_players']['evt'],),
         kwargs={
           'on_room_destroyed': lambda: self.disconnect(True),
           'on_room_completed': lambda: self.switch_context('main')
@@ -477,9 +524,10 @@ class Window(object):
       messagebox.showerror(self.window_title, "Failed to connect to server. Try again later.")
 
       if self.logger != None:
-        self.logger.log("Pyro traceback", "".join(PyroExceptionTraceback()))
+        self.logger.error("Pyro traceback", "".join(PyroExceptionTraceback()))
 
   # TODO: implement game disconnection when inside the game
+  @traced('ui')
   def disconnect(self, force=False):
     try:
       # disconnect to the server
@@ -497,22 +545,48 @@ class Window(object):
       # set window title to the default title
       self.window.wm_title(self.window_title)
 
-      # delete the connection UID
+      # delete the connection UID and the game room
       del self.game_storage['connection_uid']
+      del self.game_storage['room_id']
 
       # delete the name
       del self.game_storage['current_name']
     except SerializeError:
       if self.logger != None:
-        self.logger.log("Pyro traceback", "".join(PyroExceptionTraceback()))
+        self.logger.error("Pyro traceback", "".join(PyroExceptionTraceback()))
+
+  @traced('ui')
+  def refresh_table(self):
+    table = self.game_storage.get('table', {
+      'version': 0,
+      'room': None,
+      'players': {}
+    })
+
+    # only the changes since the version we already have are sent back
+    snapshot = self.game_manager.get_table_snapshot(self.game_storage['room_id'], table['version'])
+
+    if snapshot['is_full'] is True:
+      table['players'] = {}
+
+    table['players'].update(snapshot['players'])
+
+    for player_uid in snapshot['removed']:
+      table['players'].pop(player_uid, None)
+
+    if 'room' in snapshot:
+      table['room'] = snapshot['room']
+
+    table['version'] = snapshot['version']
+
+    self.game_storage['table'] = table
+
+    return table
 
   def reveal_all_cards(self):
-    player_uids = self.game_manager.get_player_uids()
-    player_cards = self.game_manager.get_player_cards([
-      self.game_storage['connection_uid']
-    ])
+    table = self.refresh_table()
 
-    for player_uid in player_uids:
+    for player_uid, player in table['players'].items():
       # skip to the next iteration if the player_uid is equal to the connection_uid
       if player_uid == self.game_storage['connection_uid']:
         continue
@@ -525,23 +599,23 @@ class Window(object):
 
       # loop over the cards on hand draw the reveal the hidden card
       for card in on_hand:
-        card_text = card['text']
+        card_code = card['code']
 
         # reveal the hidden card
         if card['is_hidden'] is True:
-          canvas.itemconfig(card['canvas_img'], image=self.window.card_cache[card_text]['tk_img'])
+          canvas.itemconfig(card['canvas_img'], image=self.window.card_cache[card_code]['tk_img'])
 
-      # when cached cards length does not match with the returned player_cards,
+      # when cached cards length does not match with the returned player cards,
       # slice and draw new cards on the canvas
-      if len(player_cards[player_uid]) > len(on_hand):
+      if len(player['cards']) > len(on_hand):
         # since only 2 cards is revealed in the other's on hand,
         # extract the new cards out from the list
-        new_cards = player_cards[player_uid][2:]
+        new_cards = player['cards'][2:]
 
-        self.draw_cards_on_canvas(player_uid, new_cards, False)
+        self.draw_cards_on_canvas(player_uid, new_cards, False, player['total'])
       else:
         # reflect the new score if the other players have not drawn new cards
-        self.reflect_score(player_uid, False)
+        self.reflect_score(player_uid, False, player['total'])
 
   def remove_cards_on_canvas(self, identifier):
     canvas_key = "player_canvas_%s" % identifier
@@ -558,7 +632,8 @@ class Window(object):
 
     return True
 
-  def draw_cards_on_canvas(self, identifier, cards, has_hidden_card=False):
+  @traced('ui')
+  def draw_cards_on_canvas(self, identifier, cards, has_hidden_card=False, score=None):
     # resolve the canvas id
     canvas_id = "player_canvas_%s" % identifier
     player_on_hand_key = "cards_on_hand_%s" % identifier
@@ -567,7 +642,7 @@ class Window(object):
     if player_on_hand_key in self.game_storage:
       self.load_cards(cards, self.game_storage[player_on_hand_key], self.main_gui_items[canvas_id], has_hidden_card)
 
-      self.reflect_score(identifier, has_hidden_card)
+      self.reflect_score(identifier, has_hidden_card, score)
 
   def load_cards(self, cards, card_collection, canvas, has_hidden_card=False):
     num_cards = len(cards)
@@ -579,7 +654,7 @@ class Window(object):
     # get the starting index to prevent placing card over another
     start_idx = len(card_collection)
 
-    for index, card_text in enumerate(cards):
+    for index, card_code in enumerate(cards):
       resolved_cache_item = None
       is_hidden = False
       new_idx = index + start_idx
@@ -590,10 +665,10 @@ class Window(object):
         resolved_cache_item = self.window.card_cache['blank']
 
       if resolved_cache_item is None:
-        resolved_cache_item = self.window.card_cache[card_text]
+        resolved_cache_item = self.window.card_cache[card_code]
 
          # resolve the new x_position
-      x_pos = ((new_idx * (CARD_WIDTH + 2)) + 5)
+      x_pos = ((new_idx * (get_card_width() + 2)) + 5)
 
       # draw image on the canvas
       img_item = canvas.create_image(x_pos,
@@ -604,8 +679,8 @@ class Window(object):
       # assemble card metadata
       card_metadata = {
         'canvas_img': img_item,
-        'text': card_text,
-        'orig_coords': self.window.card_cache[card_text]['coords'],
+        'code': card_code,
+        'orig_coords': self.window.card_cache[card_code]['coords'],
         'is_hidden': is_hidden
       }
 
@@ -621,15 +696,15 @@ class Window(object):
 
     cards = tmp_deck.get_cards()
 
-    for card_text in cards:
-      card = TextToCardTransformer(card_text).transform()
+    for card_code in cards:
+      card = CodeToCardTransformer(card_code).transform()
       card_img_coords = CardToCardImagePositionTransformer(card).transform()
 
       # crop the image
       resolved_face_and_shape = self.window.cards_img.crop(card_img_coords)
 
       # cache it inside the window
-      self.window.card_cache[card_text] = {
+      self.window.card_cache[card_code] = {
         'tk_img': ImageTk.PhotoImage(resolved_face_and_shape),
         'coords': card_img_coords
       }
@@ -670,8 +745,14 @@ class Window(object):
     # save the needed keys before emptying the game storage
     connection_uid = self.game_storage['connection_uid']
     current_name = self.game_storage['current_name']
+    room_id = self.game_storage['room_id']
+    table = self.game_storage.get('table')
 
-    player_uids = self.game_manager.get_player_uids()
+    # the players are already known when the table has been loaded
+    if table is not None:
+      player_uids = list(table['players'])
+    else:
+      player_uids = self.game_manager.get_player_uids(self.game_storage['room_id'])
 
     # loop through all players
     for player_uid in player_uids:
@@ -683,64 +764,98 @@ class Window(object):
     # clear the game storage
     self.game_storage.clear()
 
-    # store back the connection uid and name
+    # store back the connection uid, name and game room
     self.game_storage['connection_uid'] = connection_uid
     self.game_storage['current_name'] = current_name
+    self.game_storage['room_id'] = room_id
+
+    # keep the table so that the next refresh only asks for the changes
+    if table is not None:
+      self.game_storage['table'] = table
 
-  def set_game_manager(self, game_manager: PyroProxy):
-    self.game_manager = game_manager
+  def set_proxy_pool(self, proxies: ProxyPool):
+    self.proxies = proxies
 
   def set_logger(self, logger):
     self.logger = logger
 
-  def check_if_ready(self, stop_event, game_manager, **kwargs):
+  def run_worker(self, target, *args, **kwargs):
+    try:
+      target(*args, **kwargs)
+    except CommunicationError:
+      # drop the broken connection so that the next thread connects again
+      self.proxies.discard()
+
+      if self.logger != None:
+        self.logger.error("Pyro traceback", "".join(PyroExceptionTraceback()))
+    finally:
+      # the proxy of the thread is reused by the threads of the next rounds
+      self.proxies.release()
+
+  def check_if_ready(self, stop_event, **kwargs):
+    game_manager = self.game_manager
+    room_id = self.game_storage['room_id']
     end_time = datetime.datetime.now() + datetime.timedelta(minutes=1)
     room_is_complete = False
+    since_seq = 0
 
     while not stop_event.is_set():
-      # stop infinite loop when it passed the time delta
-      if datetime.datetime.now() >= end_time:
-        if game_manager.is_room_ready() is True:
+      remaining = (end_time - datetime.datetime.now()).total_seconds()
+
+      # stop waiting when it passed the time delta
+      if remaining <= 0:
+        if game_manager.is_room_ready(room_id) is True:
           room_is_complete = True
         break
 
-      if game_manager.is_room_ready() is True and game_manager.player_ready_count() == 4:
+      # block until something happens in the room instead of polling the server
+      response = game_manager.wait_for_events(room_id, since_seq, min(remaining, EVENT_WAIT))
+      since_seq = response['seq']
+
+      if response['ready_count'] == 4:
         room_is_complete = True
         break
 
     if stop_event.is_set():
       if self.logger != None:
-        self.logger.log("check_if_ready", "Thread terminated")
+        self.logger.debug("check_if_ready", "Thread terminated")
 
       if 'on_thread_terminated' in kwargs and callable(kwargs['on_thread_terminated']):
         kwargs['on_thread_terminated']()
     else:
       if room_is_complete is True:
         if self.logger != None:
-          self.logger.log("check_if_ready", "Go to main screen.")
+          self.logger.debug("check_if_ready", "Go to main screen.")
 
         # lock the game to prevent other players from joining
-        game_manager.lock_game(True)
+        game_manager.lock_game(room_id, True)
 
         if 'on_room_completed' in kwargs and callable(kwargs['on_room_completed']):
           kwargs['on_room_completed']()
       else:
         if self.logger != None:
           self.logger.log("check_if_ready",
-                          ("Destroy Game Room. Player count is %s" % game_manager.player_ready_count()))
+                          ("Destroy Game Room. Player count is %s" % game_manager.player_ready_count(room_id)))
 
         if 'on_room_destroyed' in kwargs and callable(kwargs['on_room_destroyed']):
           kwargs['on_room_destroyed']()
 
-  def check_if_all_acknowledged(self, stop_event, game_manager, **kwargs):
+  def check_if_all_acknowledged(self, stop_event, **kwargs):
+    game_manager = self.game_manager
+    room_id = self.game_storage['room_id']
+    since_seq = 0
+
     while not stop_event.is_set():
+      response = game_manager.wait_for_events(room_id, since_seq, EVENT_WAIT)
+      since_seq = response['seq']
+
       # all players are ready
-      if game_manager.player_count() == game_manager.player_ready_count():
+      if response['player_count'] == response['ready_count']:
         break
 
     if stop_event.is_set():
       if self.logger != None:
-        self.logger.log("check_if_ready", "Thread terminated")
+        self.logger.debug("check_if_ready", "Thread terminated")
 
       if 'on_thread_terminated' in kwargs and callable(kwargs['on_thread_terminated']):
         kwargs['on_thread_terminated']()
@@ -748,20 +863,27 @@ class Window(object):
       if 'on_acknowledge' in kwargs and callable(kwargs['on_acknowledge']):
         kwargs['on_acknowledge']()
 
-  def draw_player_cards(self, stop_event, game_manager, **kwargs):
+  def draw_player_cards(self, stop_event, **kwargs):
+    game_manager = self.game_manager
+    room_id = self.game_storage['room_id']
     excluded_uids = []
 
     # TODO: add check if the passed argument is list
     if 'excluded_uids' in kwargs:
       excluded_uids = kwargs['excluded_uids']
 
+    # events after this point wake up the listener
+    since_seq = game_manager.get_event_seq(room_id)
+
     while not stop_event.is_set():
-      on_hands = game_manager.get_player_cards(excluded_uids)
+      on_hands = game_manager.get_player_cards(room_id, excluded_uids)
 
       # no more to draw
       if len(on_hands) == 0:
         break
 
+      is_waiting = False
+
       for identifier, hand in on_hands.items():
         if len(hand) > 0:
           # exclude the identifier for the next iteration
@@ -769,38 +891,56 @@ class Window(object):
 
           if 'on_hand' in kwargs and callable(kwargs['on_hand']):
             kwargs['on_hand'](identifier, hand, True)
+        else:
+          is_waiting = True
+
+      # wait for the other players to draw their cards
+      if is_waiting is True:
+        since_seq = game_manager.wait_for_events(room_id, since_seq, EVENT_WAIT)['seq']
 
     if stop_event.is_set():
       if self.logger != None:
-        self.logger.log("draw_player_cards", "Thread terminated")
+        self.logger.debug("draw_player_cards", "Thread terminated")
 
       if 'on_thread_terminated' in kwargs and callable(kwargs['on_thread_terminated']):
         kwargs['on_thread_terminated']()
     else:
       if self.logger != None:
-        self.logger.log("draw_player_cards", "Draw complete")
+        self.logger.debug("draw_player_cards", "Draw complete")
 
       if 'on_draw_complete' in kwargs and callable(kwargs['on_draw_complete']):
         kwargs['on_draw_complete']()
 
-  def find_winners(self, stop_event, game_manager, **kwargs):
-    response = []
+  def find_winners(self, stop_event, **kwargs):
+    game_manager = self.game_manager
+    room_id = self.game_storage['room_id']
+    since_seq = kwargs.get('since_seq', 0)
 
-    while not stop_event.is_set():
-      response = game_manager.determine_winners()
+    response = game_manager.determine_winners(room_id)
 
-      if response is not None:
-        break
+    # the winners are decided once the last player locks the hand. A faster player can start
+    # the next round before they are asked for, so they are taken from the event instead
+    while response is None and not stop_event.is_set():
+      events = game_manager.wait_for_events(room_id, since_seq, EVENT_WAIT)
+      since_seq = events['seq']
+
+      for event in events['events']:
+        if event['type'] == 'winners_decided':
+          response = event['data']
+
+      # the event was dropped from the buffer of the room
+      if events['missed'] is True and response is None:
+        response = game_manager.determine_winners(room_id)
 
     if stop_event.is_set():
       if self.logger != None:
-        self.logger.log("find_winners", "Thread terminated")
+        self.logger.debug("find_winners", "Thread terminated")
 
       if 'on_thread_terminated' in kwargs and callable(kwargs['on_thread_terminated']):
         kwargs['on_thread_terminated']()
     else:
       if self.logger != None:
-        self.logger.log("find_winners", "complete")
+        self.logger.debug("find_winners", "complete")
 
       if 'on_identify_winners' in kwargs and callable(kwargs['on_identify_winners']):
         kwargs['on_identify_winners'](response)
@@ -0,0 +1,188 @@
+# engine.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import numpy as np
+from app.blackjack.cards.card import Card
+from app.blackjack.game.error import GameError
+
+# blackjack goal number
+WINNING_NUMBER = 21
+
+# same as the number of players allowed in a game room
+DEFAULT_PLAYERS = 4
+
+# totals above this value are grouped in the last histogram bucket
+MAX_TRACKED_TOTAL = 31
+
+# normalized value of each card code. Aces are tracked separately just like in the game logic
+CARD_VALUES = np.array([0 if card.get_face_value() == 'A' else card.get_normalized_value()
+                        for card in Card.get_all()], dtype=np.int16)
+
+CARD_ACES = np.array([1 if card.get_face_value() == 'A' else 0
+                      for card in Card.get_all()], dtype=np.int16)
+
+def compute_totals(card_totals, ace_counts):
+  """Vectorized version of app.blackjack.game.hand.compute_total()."""
+
+  return np.select([
+    (card_totals <= 10) & (ace_counts == 1),
+    (card_totals > 10) & (ace_counts >= 1),
+    (card_totals == 0) & (ace_counts > 1)
+  ], [
+    card_totals + 11,
+    card_totals + ace_counts,
+    card_totals + 11 + (ace_counts - 1)
+  ], default=card_totals)
+
+class SimulationResult(object):
+  """Aggregated outcome of simulated rounds."""
+
+  def __init__(self, players=DEFAULT_PLAYERS):
+    self.players = players
+    self.rounds = 0
+
+    # rounds won by each seat. Tied players are all counted as winners
+    self.wins = np.zeros(players, dtype=np.int64)
+
+    # rounds where each seat went over the winning number
+    self.busts = np.zeros(players, dtype=np.int64)
+
+    # rounds without any winner and rounds with more than one winner
+    self.no_winner_rounds = 0
+    self.tied_rounds = 0
+
+    # distribution of final totals per seat and of the winning score
+    self.total_counts = np.zeros((players, MAX_TRACKED_TOTAL + 1), dtype=np.int64)
+    self.winning_score_counts = np.zeros(WINNING_NUMBER + 1, dtype=np.int64)
+
+  def merge(self, other):
+    if other.players != self.players:
+      raise GameError("Cannot merge results of %d players with %d players" % (other.players, self.players))
+
+    self.rounds += other.rounds
+    self.wins += other.wins
+    self.busts += other.busts
+    self.no_winner_rounds += other.no_winner_rounds
+    self.tied_rounds += other.tied_rounds
+    self.total_counts += other.total_counts
+    self.winning_score_counts += other.winning_score_counts
+
+    return self
+
+  def to_dict(self):
+    return {
+      'players': self.players,
+      'rounds': self.rounds,
+      'wins': self.wins.tolist(),
+      'busts': self.busts.tolist(),
+      'no_winner_rounds': self.no_winner_rounds,
+      'tied_rounds': self.tied_rounds,
+      'total_counts': self.total_counts.tolist(),
+      'winning_score_counts': self.winning_score_counts.tolist()
+    }
+
+class Simulator(object):
+  """Plays batches of headless rounds as array operations.
+
+  Each round is dealt from a freshly shuffled shoe. Every player gets 2 cards in
+  round-robin order and then hits until the total reaches `stand_on`. Winners are
+  resolved the same way as Manager.determine_winners().
+  """
+
+  def __init__(self, players=DEFAULT_PLAYERS, decks=1, stand_on=17, rng=None):
+    if players < 1:
+      raise GameError("Simulation needs at least 1 player.")
+
+    if decks < 1:
+      raise GameError("Simulation needs at least 1 deck.")
+
+    if stand_on < 1 or stand_on > WINNING_NUMBER:
+      raise GameError("Stand on value must be between 1 and %d." % WINNING_NUMBER)
+
+    self.players = players
+    self.decks = decks
+    self.stand_on = stand_on
+
+    # seeded generator for reproducible simulations
+    if rng is None:
+      rng = np.random.default_rng()
+
+    self.rng = rng
+
+    self.shoe_size = len(CARD_VALUES) * decks
+
+    if self.shoe_size < players * 2:
+      raise GameError("Not enough cards to deal %d players." % players)
+
+  def shuffled_shoes(self, rounds):
+    # sorting random keys gives an independent permutation for each row
+    order = np.argsort(self.rng.random((rounds, self.shoe_size)), axis=1)
+
+    return (order % len(CARD_VALUES)).astype(np.int16)
+
+  def play_batch(self, rounds):
+    result = SimulationResult(self.players)
+
+    if rounds <= 0:
+      return result
+
+    shoes = self.shuffled_shoes(rounds)
+    values = CARD_VALUES[shoes]
+    aces = CARD_ACES[shoes]
+
+    # hands are stored as (rounds, players) matrices of non-ace totals and ace counts
+    card_totals = values[:, :self.players] + values[:, self.players:self.players * 2]
+    ace_counts = aces[:, :self.players] + aces[:, self.players:self.players * 2]
+
+    # position of the next card in each shoe
+    cursors = np.full(rounds, self.players * 2, dtype=np.int64)
+
+    for player in range(0, self.players):
+      active = np.flatnonzero((compute_totals(card_totals[:, player], ace_counts[:, player]) < self.stand_on) &
+                              (cursors < self.shoe_size))
+
+      # draw one card at a time for rounds where the player still hits
+      while active.size > 0:
+        drawn = cursors[active]
+
+        card_totals[active, player] += values[active, drawn]
+        ace_counts[active, player] += aces[active, drawn]
+        cursors[active] += 1
+
+        still_hitting = (compute_totals(card_totals[active, player], ace_counts[active, player]) < self.stand_on) & \
+          (cursors[active] < self.shoe_size)
+
+        active = active[still_hitting]
+
+    totals = compute_totals(card_totals, ace_counts)
+
+    # same scoring as Manager.determine_winners(): the lowest distance to the winning number wins
+    qualified = totals <= WINNING_NUMBER
+    best = np.where(qualified, totals, -1).max(axis=1)
+    winners = qualified & (totals == best[:, None])
+    winner_counts = winners.sum(axis=1)
+
+    result.rounds = rounds
+    result.wins += winners.sum(axis=0)
+    result.busts += (~qualified).sum(axis=0)
+    result.no_winner_rounds = int((winner_counts == 0).sum())
+    result.tied_rounds = int((winner_counts > 1).sum())
+
+    for player in range(0, self.players):
+      result.total_counts[player] += np.bincount(np.minimum(totals[:, player], MAX_TRACKED_TOTAL),
+                                                 minlength=MAX_TRACKED_TOTAL + 1)
+
+    result.winning_score_counts += np.bincount(best[winner_counts > 0], minlength=WINNING_NUMBER + 1)
+
+    return result
+
+  def run(self, rounds, batch_size=100000):
+    result = SimulationResult(self.players)
+
+    while result.rounds < rounds:
+      result.merge(self.play_batch(min(batch_size, rounds - result.rounds)))
+
+    return result
@@ -0,0 +1,74 @@
+# runner.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import os
+import multiprocessing
+import numpy as np
+from app.blackjack.simulation.engine import Simulator, SimulationResult, DEFAULT_PLAYERS
+from app.blackjack.game.error import GameError
+
+def split_rounds(rounds, workers):
+  # spread the remainder over the first shards so that the split only depends on the arguments
+  shard_size, remainder = divmod(rounds, workers)
+
+  return [shard_size + (1 if index < remainder else 0) for index in range(0, workers)]
+
+def run_shard(shard):
+  rounds, seed_sequence, settings = shard
+
+  simulator = Simulator(settings['players'],
+                        settings['decks'],
+                        settings['stand_on'],
+                        np.random.default_rng(seed_sequence))
+
+  # only the aggregated result is sent back to the parent process
+  return simulator.run(rounds, settings['batch_size'])
+
+class ShardedRunner(object):
+  """Splits a simulation across a process pool with an independent random stream per shard."""
+
+  def __init__(self, workers=None, seed=None):
+    if workers is None:
+      workers = os.cpu_count() or 1
+
+    if workers < 1:
+      raise GameError("Simulation needs at least 1 worker.")
+
+    self.workers = workers
+
+    # the entropy is kept so that unseeded runs can still be reproduced
+    self.seed_sequence = np.random.SeedSequence(seed)
+
+  def get_seed(self):
+    return self.seed_sequence.entropy
+
+  def run(self, rounds, players=DEFAULT_PLAYERS, decks=1, stand_on=17, batch_size=100000):
+    settings = {
+      'players': players,
+      'decks': decks,
+      'stand_on': stand_on,
+      'batch_size': batch_size
+    }
+
+    # every shard gets its own child seed. Spawning from a fresh copy of the root sequence
+    # keeps the streams identical across calls with the same seed and worker count
+    seed_sequences = np.random.SeedSequence(self.seed_sequence.entropy).spawn(self.workers)
+
+    shards = list(zip(split_rounds(rounds, self.workers), seed_sequences, [settings] * self.workers))
+
+    if self.workers == 1:
+      shard_results = [run_shard(shards[0])]
+    else:
+      with multiprocessing.Pool(self.workers) as pool:
+        shard_results = pool.map(run_shard, shards, chunksize=1)
+
+    result = SimulationResult(players)
+
+    # merge in shard order
+    for shard_result in shard_results:
+      result.merge(shard_result)
+
+    return result
@@ -9,53 +9,102 @@ from app.cards.error import CardError
 FACE_VALUES = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
 SHAPES = ["clover", "diamond", "heart", "spade"]
 
+# number of distinct cards in a standard deck. Cards are encoded as integers
+# from 0 to CARD_COUNT - 1 ordered by shape then face value
+CARD_COUNT = len(SHAPES) * len(FACE_VALUES)
+
+# canonical card instances keyed by card class
+_card_pools = {}
+
 class Card(object):
+  """Immutable playing card. Use Card.get() or Card.from_code() to get the shared instance."""
 
-  def __init__(self, shape=None, face_value=None):
-    # translated value of the face value for example
-    # A of Hearts = 1
-    self.normalized_value = None
+  __slots__ = ('shape', 'face_value', 'normalized_value', 'code')
 
-    # store the shape if provided
-    if shape != None:
-      self.set_shape(shape)
+  # translated value of the face value for example
+  # A of Hearts = 1. Number cards are translated to their integer value.
+  FACE_NORMALIZED_VALUES = {
+    'A': 1,
+    'J': 11,
+    'Q': 12,
+    'K': 13
+  }
 
-    # store the face_value if provided
-    if face_value != None:
-      self.set_face_value(face_value)
+  def __init__(self, shape, face_value):
+    if not shape in SHAPES:
+      raise CardError("Shape: %s does not exist" % shape)
 
-  def get_shape(self):
-    return self.shape
+    if not face_value in FACE_VALUES:
+      raise CardError("Face Value: %s does not exist" % face_value)
+
+    object.__setattr__(self, 'shape', shape)
+    object.__setattr__(self, 'face_value', face_value)
+    object.__setattr__(self, 'code', SHAPES.index(shape) * len(FACE_VALUES) + FACE_VALUES.index(face_value))
+    object.__setattr__(self, 'normalized_value', self.normalize(face_value))
+
+  def __setattr__(self, name, value):
+    raise CardError("Cards are immutable. Can't set attribute: %s" % name)
+
+  def __delattr__(self, name):
+    raise CardError("Cards are immutable. Can't delete attribute: %s" % name)
+
+  def __eq__(self, other):
+    return type(self) is type(other) and self.code == other.code
+
+  def __hash__(self):
+    return hash((type(self), self.code))
+
+  def __reduce__(self):
+    # unpickle to the canonical instance
+    return (type(self).from_code, (self.code,))
+
+  def __repr__(self):
+    return "%s(%r, %r)" % (type(self).__name__, self.shape, self.face_value)
+
+  @classmethod
+  def normalize(cls, face_value):
+    if face_value in cls.FACE_NORMALIZED_VALUES:
+      return cls.FACE_NORMALIZED_VALUES[face_value]
+
+    return int(face_value)
 
-  def set_shape(self, shape):
-    if shape in SHAPES:
-      self.shape = shape
-    else:
+  @classmethod
+  def get_all(cls):
+    pool = _card_pools.get(cls)
+
+    # build the canonical cards of this class once
+    if pool is None:
+      pool = tuple(cls(shape, face_value) for shape in SHAPES for face_value in FACE_VALUES)
+      _card_pools[cls] = pool
+
+    return pool
+
+  @classmethod
+  def from_code(cls, code):
+    if not isinstance(code, int) or code < 0 or code >= CARD_COUNT:
+      raise CardError("Card code: %s does not exist" % code)
+
+    return cls.get_all()[code]
+
+  @classmethod
+  def get(cls, shape, face_value):
+    if not shape in SHAPES:
       raise CardError("Shape: %s does not exist" % shape)
 
+    if not face_value in FACE_VALUES:
+      raise CardError("Face Value: %s does not exist" % face_value)
+
+    return cls.get_all()[SHAPES.index(shape) * len(FACE_VALUES) + FACE_VALUES.index(face_value)]
+
+  def get_shape(self):
+    return self.shape
+
   def get_face_value(self):
     return self.face_value
 
-  def set_face_value(self, face_value):
-    if face_value in FACE_VALUES:
-      self.face_value = face_value
-    else:
-      raise CardError("Face Value: %s does not exist" % face_value)
+  def get_code(self):
+    return self.code
 
   def get_normalized_value(self):
-    try:
-      self.normalized_value = int(self.face_value)
-    except ValueError:
-      if self.face_value == 'J':
-        self.normalized_value = 11
-      elif self.face_value == 'Q':
-        self.normalized_value = 12
-      elif self.face_value == 'K':
-        self.normalized_value = 13
-      else:
-        #value for Ace
-        self.normalized_value = 1
-
     return self.normalized_value
 
-
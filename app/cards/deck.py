@@ -6,26 +6,31 @@
 
 from random import shuffle
 from collections import deque
-from app.cards.card import Card, FACE_VALUES, SHAPES
+from app.cards.card import Card
 from app.cards.error import DeckError
 
 class Deck(object):
 
-  def __init__(self):
+  def __init__(self, rng=None):
     self.cards = deque([])
 
+    # random.Random instance for seeded shuffles. The global generator is used when not provided
+    self.rng = rng
+
   def create(self):
     self.cards.clear()
 
-    for shape in SHAPES:
-      for face_value in FACE_VALUES:
-        self.cards.append(Card(shape, face_value))
+    # reuse the shared card instances instead of allocating new ones
+    self.cards.extend(Card.get_all())
 
   def shuffle(self):
     if len(self.cards) == 0:
       raise DeckError("No cards in deck. call Deck.create()")
 
-    shuffle(self.cards)
+    if self.rng is None:
+      shuffle(self.cards)
+    else:
+      self.rng.shuffle(self.cards)
 
   def pluck(self, number_of_cards):
     if number_of_cards <= 0:
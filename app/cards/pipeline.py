@@ -0,0 +1,83 @@
+# pipeline.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import queue
+import threading
+from app.tracing import traced
+
+class ShuffleWorker(object):
+  """Background thread that shuffles the spare shoes of one or more pipelines."""
+
+  def __init__(self):
+    self.requests = queue.Queue()
+
+    self.thread = threading.Thread(name="shuffle_worker_thread", target=self.run)
+    self.thread.daemon = True
+    self.thread.start()
+
+  def request(self, pipeline):
+    self.requests.put(pipeline)
+
+  def run(self):
+    while True:
+      pipeline = self.requests.get()
+
+      # None is used to stop the worker
+      if pipeline is None:
+        break
+
+      pipeline.prepare_spare()
+
+  def stop(self):
+    self.requests.put(None)
+
+class ShoePipeline(object):
+  """Double buffered shoes. The spare shoe is shuffled in the background while the current one is dealt."""
+
+  def __init__(self, shoe_factory, worker=None):
+    # the first shoe is prepared right away since there is nothing to swap with yet
+    self.current = shoe_factory()
+    self.current.create()
+    self.current.shuffle()
+
+    self.spare = shoe_factory()
+    self.spare.create()
+
+    # set when the spare shoe is shuffled and can be swapped in
+    self.ready = threading.Event()
+
+    # prevents concurrent swaps from taking the same spare shoe
+    self.lock = threading.Lock()
+
+    # pipelines can share a worker so that many game rooms do not need a thread each
+    if worker is None:
+      worker = ShuffleWorker()
+
+    self.worker = worker
+
+    # shuffle the spare shoe ahead of time
+    self.worker.request(self)
+
+  def prepare_spare(self):
+    self.spare.shuffle()
+    self.ready.set()
+
+  def get_shoe(self):
+    return self.current
+
+  @traced('deck')
+  def swap(self):
+    with self.lock:
+      # only waits when swaps are requested faster than a shoe can be shuffled
+      self.ready.wait()
+      self.ready.clear()
+
+      self.current, self.spare = self.spare, self.current
+
+      # the shoe that was just dealt is shuffled in the background
+      self.worker.request(self)
+
+      return self.current
@@ -0,0 +1,91 @@
+# shoe.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+from array import array
+from random import shuffle
+from app.cards.card import Card, CARD_COUNT
+from app.cards.error import DeckError
+
+MAX_DECKS = 8
+
+class Shoe(object):
+  """Multiple decks stored as card codes. Cards are drawn by moving a cursor over the array."""
+
+  card_class = Card
+
+  def __init__(self, decks=1, penetration=0.75, rng=None):
+    if not isinstance(decks, int) or decks < 1 or decks > MAX_DECKS:
+      raise DeckError("Number of decks should be from 1 to %d." % MAX_DECKS)
+
+    if penetration <= 0 or penetration > 1:
+      raise DeckError("Penetration should be greater than 0 and at most 1.")
+
+    self.decks = decks
+    self.penetration = penetration
+
+    # random.Random instance for seeded shuffles. The global generator is used when not provided
+    self.rng = rng
+
+    # card codes of the shoe and position of the next card to be drawn
+    self.cards = array('B')
+    self.cursor = 0
+
+    # position of the cut card
+    self.cut = 0
+
+  def create(self):
+    size = CARD_COUNT * self.decks
+
+    # the cards are only allocated once, succeeding calls just put back the drawn cards
+    if len(self.cards) != size:
+      self.cards = array('B', list(range(0, CARD_COUNT)) * self.decks)
+
+    self.cursor = 0
+    self.cut = int(size * self.penetration)
+
+  def shuffle(self):
+    if len(self.cards) == 0:
+      raise DeckError("No cards in shoe. call Shoe.create()")
+
+    # put back the drawn cards and shuffle in place
+    self.cursor = 0
+
+    if self.rng is None:
+      shuffle(self.cards)
+    else:
+      self.rng.shuffle(self.cards)
+
+  def draw_codes(self, number_of_cards):
+    if not isinstance(number_of_cards, int):
+      raise DeckError("Can't get cards from the shoe. Please specify an integer value.")
+
+    if number_of_cards <= 0:
+      raise DeckError("Can't get cards from the shoe. Please specify an integer value greater than 0.")
+
+    if self.cursor + number_of_cards > len(self.cards):
+      raise DeckError("Can't get %d cards from the shoe. Only %d cards left." %
+                      (number_of_cards, self.get_remaining_cards()))
+
+    codes = self.cards[self.cursor:self.cursor + number_of_cards].tolist()
+    self.cursor += number_of_cards
+
+    return codes
+
+  def pluck(self, number_of_cards):
+    return [self.card_class.from_code(code) for code in self.draw_codes(number_of_cards)]
+
+  def get_cards(self):
+    if len(self.cards) == 0:
+      raise DeckError("No cards in shoe. call Shoe.create()")
+
+    return [self.card_class.from_code(code) for code in self.cards[self.cursor:]]
+
+  def get_remaining_cards(self):
+    return len(self.cards) - self.cursor
+
+  def needs_reshuffle(self):
+    # the cut card has been reached
+    return self.cursor >= self.cut
@@ -0,0 +1,153 @@
+# sprite.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import os
+import struct
+from app.cards.card import Card, SHAPES, FACE_VALUES
+from app.cards.error import TransformerError
+from app.cards.transformer import Transformer
+from app.blackjack.game.error import GameError
+
+# positions of the cards in resources/images/cards.png. Only the game client imports this
+# module so that the server runs without the sprite
+MOVE_X = 78
+MOVE_Y = 120
+
+BLANK_COORDS = (158, 492, 237, 615)
+
+class CardImagePositionToCardTransformer(Transformer):
+  """Transformer class for x and y coordinates back to Card Instance"""
+
+  def __init__(self, position=None):
+    Transformer.__init__(self)
+
+    # Initialize coordinates to None
+    self.position = None
+
+    if position != None:
+      self.set_position(position)
+
+  def set_position(self, position):
+    self.position = position
+
+  def transform(self):
+    if self.position is None:
+      raise TransformerError("Set coordinates first before transforming it.")
+
+    card_attrs = get_card_attrs(self.position)
+
+    return Card.get(card_attrs['shape'], card_attrs['face'])
+
+class CardToCardImagePositionTransformer(Transformer):
+  """Transformer class for cards to be converted to x and y coordinates"""
+
+  def __init__(self, card=None):
+    Transformer.__init__(self)
+
+    # Initialize card to None
+    self.card = None
+
+    if card != None:
+      self.set_card(card)
+
+  def set_card(self, card: Card):
+    self.card = card
+
+  def transform(self):
+    if self.card is None:
+      raise TransformerError("Set a card first before transforming it")
+
+    return get_card_coords(self.card.get_face_value(), self.card.get_shape())
+
+# [Image Position Resolution] ::start
+CARD_SPRITE_PATH = "resources/images/cards.png"
+
+# the sprite has a column per face value and a row per shape plus the row of the card backs
+SPRITE_COLUMNS = 13
+SPRITE_ROWS = 5
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# card sizes and the coordinates of the cards in the sprite, indexed both ways. Built on first use
+sprite_index = None
+
+def read_png_size(path):
+  # the size is stored in the IHDR chunk right after the signature so the image is not decoded
+  with open(path, 'rb') as image:
+    header = image.read(24)
+
+  if len(header) < 24 or header[:8] != PNG_SIGNATURE or header[12:16] != b'IHDR':
+    raise GameError("Card Faces sprite is not a PNG image!")
+
+  return struct.unpack('>II', header[16:24])
+
+def get_sprite_index():
+  global sprite_index
+
+  if sprite_index is None:
+    card_img_path = os.path.join(os.getcwd(), CARD_SPRITE_PATH)
+
+    if not os.path.exists(card_img_path):
+      raise GameError("Card Faces sprite does not exist!")
+
+    width, height = read_png_size(card_img_path)
+
+    card_width = int(width / SPRITE_COLUMNS)
+    card_height = int(height / SPRITE_ROWS)
+
+    coords = {}
+    cards = {}
+
+    for shape_idx in range(0, len(SHAPES)):
+      for face_idx in range(0, len(FACE_VALUES)):
+        position = (face_idx * card_width, shape_idx * card_height,
+                    (face_idx + 1) * card_width, (shape_idx + 1) * card_height)
+
+        coords[(FACE_VALUES[face_idx], SHAPES[shape_idx])] = position
+        cards[position] = (FACE_VALUES[face_idx], SHAPES[shape_idx])
+
+    # built completely before it is shared so other threads never see a partial index
+    sprite_index = {
+      'card_width': card_width,
+      'card_height': card_height,
+      'coords': coords,
+      'cards': cards
+    }
+
+  return sprite_index
+
+def get_card_width():
+  return get_sprite_index()['card_width']
+
+def get_card_height():
+  return get_sprite_index()['card_height']
+# [Image Position Resolution] ::end
+
+# utility functions
+def get_card_attrs(coords):
+  found_card = get_sprite_index()['cards'].get(tuple(coords))
+
+  if found_card is None:
+    raise TransformerError("Cant transform to card by its position")
+
+  return {
+    'face': found_card[0],
+    'shape': found_card[1]
+  }
+
+def get_card_coords(face_value, shape):
+  coords = get_sprite_index()['coords'].get((face_value, shape))
+
+  if coords is None:
+    if not face_value in FACE_VALUES:
+      raise TransformerError("Face Value: %s is not a valid face." % face_value)
+
+    if not shape in SHAPES:
+      raise TransformerError("Shape: %s is not a valid card shape." % shape)
+
+    raise TransformerError("Card coordinates not found.")
+
+  return coords
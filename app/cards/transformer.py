@@ -4,17 +4,9 @@
 # Licensed under MIT
 # Version 2.0.0
 
-import os
 import re
-from PIL import Image
-from app.cards.card import Card, SHAPES, FACE_VALUES
+from app.cards.card import Card, SHAPES, FACE_VALUES, CARD_COUNT
 from app.cards.error import TransformerError
-from app.blackjack.game.error import GameError
-
-MOVE_X = 78
-MOVE_Y = 120
-
-BLANK_COORDS = (158, 492, 237, 615)
 
 class Transformer(object):
   """Base class for card transformers in this module."""
@@ -65,33 +57,10 @@ class TextToCardTransformer(Transformer):
     if not matches:
       raise TransformerError("Cant deserialize card: %s" % self.text)
 
-    return Card(matches.group(2), matches.group(1))
-
-class CardImagePositionToCardTransformer(Transformer):
-  """Transformer class for x and y coordinates back to Card Instance"""
-
-  def __init__(self, position=None):
-    Transformer.__init__(self)
-
-    # Initialize coordinates to None
-    self.position = None
-
-    if position != None:
-      self.set_position(position)
+    return Card.get(matches.group(2), matches.group(1))
 
-  def set_position(self, position):
-    self.position = position
-
-  def transform(self):
-    if self.position is None:
-      raise TransformerError("Set coordinates first before transforming it.")
-
-    card_attrs = get_card_attrs(self.position)
-
-    return Card(card_attrs['shape'], card_attrs['face'])
-
-class CardToCardImagePositionTransformer(Transformer):
-  """Transformer class for cards to be converted to x and y coordinates"""
+class CardToCodeTransformer(Transformer):
+  """Transformer class for cards to compact integer codes for sending over the network"""
 
   def __init__(self, card=None):
     Transformer.__init__(self)
@@ -109,95 +78,43 @@ class CardToCardImagePositionTransformer(Transformer):
     if self.card is None:
       raise TransformerError("Set a card first before transforming it")
 
-    return get_card_coords(self.card.get_face_value(), self.card.get_shape())
-
-# [Image Position Resolution] ::start
-card_img_path = os.path.join(os.getcwd(), "resources/images/cards.png")
-
-if not os.path.exists(card_img_path):
-  raise GameError("Card Faces sprite does not exist!")
+    return self.card.get_code()
 
-# open the image file
-card_img = Image.open(card_img_path)
+class CodeToCardTransformer(Transformer):
+  """Transformer class for deserializing integer codes back to card instances"""
 
-# destructure list
-width, height = card_img.size
-
-CARD_WIDTH = int(width / 13)
-CARD_HEIGHT = int(height / 5)
-
-top = 0
-right = CARD_WIDTH
-bottom = CARD_HEIGHT
-left = 0
-
-# create tmp coordinates
-tmp_top = top
-tmp_right = right
-tmp_bottom = bottom
-tmp_left = left
-
-# prevent garbage collection that's why we are storing the reference to the window object
-resolved_cards = {}
+  def __init__(self, code=None):
+    Transformer.__init__(self)
 
-for shape_idx in range(0, len(SHAPES)):
-  for face_idx in range(0, len(FACE_VALUES)):
-    # assemble dictionary key
-    key = "%s of %s" % (FACE_VALUES[face_idx], SHAPES[shape_idx])
+    # Initialize code to None
+    self.code = None
 
-    # store the position
-    resolved_cards[key] = (tmp_left, tmp_top, tmp_right, tmp_bottom)
+    if code != None:
+      self.set_code(code)
 
-    # adjust left and right coordinates
-    tmp_left += right
-    tmp_right += right
+  def set_code(self, code):
+    self.code = code
 
-  # reset top and left coordinates
-  tmp_left = 0
-  tmp_right = right
+  def transform(self):
+    if self.code is None:
+      raise TransformerError("Set a card code first before transforming it")
 
-  # adjust top and bottom coordinates
-  tmp_top += bottom
-  tmp_bottom += bottom
+    # validate the code before looking up the shared card instance
+    get_code_attrs(self.code)
 
-# close the file pointer
-card_img.close()
-# [Image Position Resolution] ::end
+    return Card.from_code(self.code)
 
 # utility functions
-def get_card_attrs(coords):
-  found_card = None
-
-  for card, card_coords in resolved_cards.items():
-    if set(coords) == set(card_coords) and len(coords) == len(card_coords):
-      found_card = card
-      break
-
-  if found_card is None:
-    raise TransformerError("Cant transform to card by its position")
-
-  # convert to card instance to extract face and shape
-  transformed_card = TextToCardTransformer(found_card).transform()
+def get_code_attrs(code):
+  if not isinstance(code, int) or code < 0 or code >= CARD_COUNT:
+    raise TransformerError("Cant deserialize card code: %s" % code)
 
   return {
-    'face': transformed_card.get_face_value(),
-    'shape': transformed_card.get_shape()
+    'face': FACE_VALUES[code % len(FACE_VALUES)],
+    'shape': SHAPES[code // len(FACE_VALUES)]
   }
 
-def get_card_coords(face_value, shape):
-  if not face_value in FACE_VALUES:
-    raise TransformerError("Face Value: %s is not a valid face." % face_value)
-
-  if not shape in SHAPES:
-    raise TransformerError("Shape: %s is not a valid card shape." % shape)
-
-  # assemble dictionary key
-  card_key = "%s of %s" % (face_value, shape)
-
-  # throw error when card_key does not exist
-  if not card_key in resolved_cards:
-    raise TransformerError("Card coordinates not found.")
-
-  return resolved_cards[card_key]
-
+def code_to_text(code):
+  attrs = get_code_attrs(code)
 
+  return "%s of %s" % (attrs['face'], attrs['shape'])
@@ -4,14 +4,200 @@
 # Licensed under MIT
 # Version 2.0.0
 
+import sys
+import json
+import time
+import queue
+import atexit
+import threading
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {
+  DEBUG: "DEBUG",
+  INFO: "INFO",
+  WARNING: "WARNING",
+  ERROR: "ERROR"
+}
+
+LEVELS = dict((name.lower(), level) for level, name in LEVEL_NAMES.items())
+
+# records waiting to be written. Records are dropped once it is full
+QUEUE_SIZE = 10000
+
+# above this fill ratio only one in SAMPLE_EVERY records below WARNING is kept
+HIGH_WATERMARK = 0.75
+SAMPLE_EVERY = 10
+
+# seconds the pending records get to be written when the process exits
+CLOSE_TIMEOUT = 2
+
 class Logger(object):
+  """Queues records and writes them from a background thread so that logging never waits for output."""
 
-  def __init__(self, title="Logger"):
+  def __init__(self, title="Logger", level=INFO, structured=False, queue_size=QUEUE_SIZE, stream=None):
     self.title = title
 
-  def log(self, label, message):
-    print("%s - %s:" % (self.title, label))
-    print(message)
-    print("")
+    # a level number or one of "debug", "info", "warning" and "error"
+    self.set_level(level)
+
+    # one JSON object per line instead of text
+    self.structured = structured
+
+    self.stream = stream
+    self.queue = queue.Queue(queue_size)
+    self.high_watermark = int(queue_size * HIGH_WATERMARK)
+
+    # records left out under backpressure, written out once the queue drains
+    self.dropped = 0
+    self.sampled = 0
+    self.drop_lock = threading.Lock()
+
+    # the writer thread is started by the first record
+    self.thread = None
+    self.start_lock = threading.Lock()
+
+  def set_level(self, level):
+    if isinstance(level, str):
+      if not level.lower() in LEVELS:
+        raise ValueError("Log level: %s is not one of %s." % (level, ", ".join(sorted(LEVELS, key=LEVELS.get))))
+
+      level = LEVELS[level.lower()]
+    elif not isinstance(level, int) or isinstance(level, bool):
+      raise ValueError("Log level: %r should be a name or a number." % (level,))
+
+    self.level = level
+
+  def is_enabled_for(self, level):
+    return level >= self.level
+
+  def log(self, label, message, *args, level=INFO, **fields):
+    if level < self.level:
+      return
+
+    if self.thread is None:
+      self.start()
+
+    # under backpressure the less important records are sampled
+    if level < WARNING and self.queue.qsize() >= self.high_watermark:
+      with self.drop_lock:
+        self.sampled += 1
+
+        if self.sampled % SAMPLE_EVERY != 0:
+          self.dropped += 1
+          return
+
+    # the message is only formatted by the writer thread
+    try:
+      self.queue.put_nowait((time.time(), level, label, message, args, fields))
+    except queue.Full:
+      with self.drop_lock:
+        self.dropped += 1
+
+  def debug(self, label, message, *args, **fields):
+    self.log(label, message, *args, level=DEBUG, **fields)
+
+  def info(self, label, message, *args, **fields):
+    self.log(label, message, *args, level=INFO, **fields)
+
+  def warning(self, label, message, *args, **fields):
+    self.log(label, message, *args, level=WARNING, **fields)
+
+  def error(self, label, message, *args, **fields):
+    self.log(label, message, *args, level=ERROR, **fields)
+
+  def start(self):
+    with self.start_lock:
+      if self.thread is not None:
+        return
+
+      self.thread = threading.Thread(name="logger_thread", target=self.run)
+      self.thread.daemon = True
+      self.thread.start()
+
+    atexit.register(self.close)
+
+  def close(self):
+    if self.thread is None:
+      return
+
+    # the writer stops after the records queued before this one
+    try:
+      self.queue.put(None, timeout=CLOSE_TIMEOUT)
+    except queue.Full:
+      return
+
+    self.thread.join(CLOSE_TIMEOUT)
+
+  def run(self):
+    while True:
+      records = [self.queue.get()]
+
+      # write everything that is queued at once
+      while len(records) < self.queue.maxsize:
+        try:
+          records.append(self.queue.get_nowait())
+        except queue.Empty:
+          break
+
+      lines = []
+
+      for record in records:
+        if record is None:
+          continue
+
+        lines.append(self.format(*record))
+
+      with self.drop_lock:
+        dropped, self.dropped = self.dropped, 0
+
+      if dropped > 0:
+        lines.append(self.format(time.time(), WARNING, "logger", "%d record(s) dropped", (dropped,), {}))
+
+      if len(lines) > 0:
+        self.write(lines)
+
+      if None in records:
+        return
+
+  def format(self, created, level, label, message, args, fields):
+    try:
+      message = message % args if len(args) > 0 else str(message)
+    except Exception as error:
+      # the logged values can change while they are formatted
+      message = "unformattable message %r: %s" % (message, error)
+
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(created)) + (".%03d" % (created % 1 * 1000))
+
+    if self.structured is True:
+      record = {
+        'time': timestamp,
+        'level': LEVEL_NAMES.get(level, str(level)),
+        'logger': self.title,
+        'label': str(label),
+        'message': message
+      }
+
+      record.update(fields)
+
+      return json.dumps(record, default=str)
+
+    line = "%s %s %s - %s: %s" % (timestamp, LEVEL_NAMES.get(level, str(level)), self.title, label, message)
+
+    if len(fields) > 0:
+      line += " " + " ".join("%s=%s" % (key, value) for key, value in sorted(fields.items()))
+
+    return line
 
+  def write(self, lines):
+    stream = self.stream if self.stream is not None else sys.stdout
 
+    try:
+      stream.write("\n".join(lines) + "\n")
+      stream.flush()
+    except Exception:
+      # a broken output never takes the process down
+      pass
@@ -0,0 +1,259 @@
+# metrics.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import time
+import bisect
+import weakref
+import functools
+import threading
+
+# upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+class MetricsShard(object):
+  """Counters and histograms written by a single thread."""
+
+  __slots__ = ('counters', 'histograms', 'sums')
+
+  def __init__(self):
+    self.counters = {}
+    self.histograms = {}
+    self.sums = {}
+
+class Metrics(object):
+  """Counters, gauges and latency histograms. Each thread records into its own shard so recording takes no locks."""
+
+  def __init__(self, prefix="blackjack", label_name="method", buckets=LATENCY_BUCKETS):
+    self.prefix = prefix
+    self.label_name = label_name
+    self.buckets = buckets
+
+    # shard of the current thread and every live shard with a weak reference to its thread
+    self.local = threading.local()
+    self.shards = []
+
+    # what threads that have exited recorded. Pool threads come and go with the connections
+    self.retired = MetricsShard()
+
+    # only taken when a thread records for the first time and when collecting
+    self.shards_lock = threading.Lock()
+
+    # callables read when the metrics are collected
+    self.gauges = {}
+
+  def shard(self):
+    shard = getattr(self.local, 'shard', None)
+
+    if shard is None:
+      shard = MetricsShard()
+      self.local.shard = shard
+
+      with self.shards_lock:
+        self.retire_shards()
+        self.shards.append((weakref.ref(threading.current_thread()), shard))
+
+    return shard
+
+  def retire_shards(self):
+    # called with shards_lock held. Shards of exited threads are no longer written to
+    live = []
+
+    for thread_ref, shard in self.shards:
+      thread = thread_ref()
+
+      if thread is not None and thread.is_alive():
+        live.append((thread_ref, shard))
+        continue
+
+      for key, value in shard.counters.items():
+        self.retired.counters[key] = self.retired.counters.get(key, 0) + value
+
+      for key, counts in shard.histograms.items():
+        retired_counts = self.retired.histograms.setdefault(key, [0] * len(counts))
+
+        for index, count in enumerate(counts):
+          retired_counts[index] += count
+
+        self.retired.sums[key] = self.retired.sums.get(key, 0.0) + shard.sums.get(key, 0.0)
+
+    self.shards = live
+
+  def increment(self, name, label='', value=1):
+    counters = self.shard().counters
+    key = (name, label)
+
+    counters[key] = counters.get(key, 0) + value
+
+  def observe(self, name, seconds, label=''):
+    shard = self.shard()
+    key = (name, label)
+
+    counts = shard.histograms.get(key)
+
+    # the buckets of a histogram are allocated once per thread
+    if counts is None:
+      counts = [0] * (len(self.buckets) + 1)
+      shard.histograms[key] = counts
+      shard.sums[key] = 0.0
+
+    counts[bisect.bisect_left(self.buckets, seconds)] += 1
+    shard.sums[key] += seconds
+
+  def set_gauge(self, name, getter):
+    self.gauges[name] = getter
+
+  def collect(self):
+    result = {
+      'counters': {},
+      'gauges': {},
+      'histograms': {}
+    }
+
+    with self.shards_lock:
+      self.retire_shards()
+
+      shards = [shard for _, shard in self.shards]
+
+      # copied under the lock since retiring adds to it
+      retired = MetricsShard()
+      retired.counters = dict(self.retired.counters)
+      retired.histograms = dict((key, list(counts)) for key, counts in self.retired.histograms.items())
+      retired.sums = dict(self.retired.sums)
+
+    for shard in shards + [retired]:
+      # copies are taken since the owning threads keep recording
+      for (name, label), value in dict(shard.counters).items():
+        counters = result['counters'].setdefault(name, {})
+        counters[label] = counters.get(label, 0) + value
+
+      sums = dict(shard.sums)
+
+      for (name, label), counts in dict(shard.histograms).items():
+        histogram = result['histograms'].setdefault(name, {}).setdefault(label, {
+          'buckets': [0] * (len(self.buckets) + 1),
+          'count': 0,
+          'sum': 0.0
+        })
+
+        for index, count in enumerate(list(counts)):
+          histogram['buckets'][index] += count
+          histogram['count'] += count
+
+        histogram['sum'] += sums.get((name, label), 0.0)
+
+    for name, getter in list(self.gauges.items()):
+      result['gauges'][name] = getter()
+
+    result['bucket_bounds'] = list(self.buckets)
+
+    return result
+
+  def to_text(self):
+    collected = self.collect()
+    lines = []
+
+    for name, values in sorted(collected['counters'].items()):
+      lines.append("# TYPE %s_%s counter" % (self.prefix, name))
+
+      for label, value in sorted(values.items()):
+        lines.append("%s_%s%s %s" % (self.prefix, name, self.format_labels(label), value))
+
+    for name, value in sorted(collected['gauges'].items()):
+      lines.append("# TYPE %s_%s gauge" % (self.prefix, name))
+      lines.append("%s_%s %s" % (self.prefix, name, value))
+
+    for name, values in sorted(collected['histograms'].items()):
+      lines.append("# TYPE %s_%s histogram" % (self.prefix, name))
+
+      for label, histogram in sorted(values.items()):
+        cumulative = 0
+
+        for bound, count in zip(list(self.buckets) + ['+Inf'], histogram['buckets']):
+          cumulative += count
+          lines.append("%s_%s_bucket%s %d" % (self.prefix, name, self.format_labels(label, bound), cumulative))
+
+        lines.append("%s_%s_sum%s %f" % (self.prefix, name, self.format_labels(label), histogram['sum']))
+        lines.append("%s_%s_count%s %d" % (self.prefix, name, self.format_labels(label), histogram['count']))
+
+    return "\n".join(lines) + "\n"
+
+  def format_labels(self, label, bound=None):
+    labels = []
+
+    if label != '':
+      labels.append('%s="%s"' % (self.label_name, label))
+
+    if bound is not None:
+      labels.append('le="%s"' % bound)
+
+    if len(labels) == 0:
+      return ""
+
+    return "{%s}" % ",".join(labels)
+
+def measured(method):
+  """Records the calls, errors and latency of a method of an object with a `metrics` attribute."""
+
+  name = method.__name__
+
+  @functools.wraps(method)
+  def call(self, *args, **kwargs):
+    start = time.perf_counter()
+
+    try:
+      return method(self, *args, **kwargs)
+    except Exception:
+      self.metrics.increment('rpc_errors', name)
+      raise
+    finally:
+      self.metrics.observe('rpc_seconds', time.perf_counter() - start, name)
+
+  return call
+
+class MetricsExporter(object):
+  """Serves the metrics as text over HTTP on a background thread."""
+
+  def __init__(self, metrics, host="localhost", port=9100):
+    # imported here so that servers without the exporter start without the http modules
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+
+    self.metrics = metrics
+
+    exporter = self
+
+    class Handler(BaseHTTPRequestHandler):
+      def do_GET(self):
+        if self.path != '/metrics':
+          self.send_error(404)
+          return
+
+        body = exporter.metrics.to_text().encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+      def log_message(self, format, *args):
+        # requests are not logged
+        pass
+
+    class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+      daemon_threads = True
+
+    self.server = ThreadingHTTPServer((host, port), Handler)
+
+    self.thread = threading.Thread(name="metrics_exporter_thread", target=self.server.serve_forever)
+    self.thread.daemon = True
+
+  def start(self):
+    self.thread.start()
+
+  def stop(self):
+    self.server.shutdown()
+    self.server.server_close()
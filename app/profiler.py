@@ -0,0 +1,218 @@
+# profiler.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import os
+import sys
+import time
+import atexit
+import threading
+import tracemalloc
+
+# seconds between two samples of the thread stacks
+SAMPLE_INTERVAL = 0.01
+
+# seconds between two writes of the collapsed stacks
+FLUSH_INTERVAL = 60
+
+# frames kept for every traced memory allocation
+MEMORY_FRAMES = 10
+
+class Profiler(object):
+  """Samples the stacks of the server threads and takes memory snapshots on demand."""
+
+  def __init__(self, output="profile.folded", interval=SAMPLE_INTERVAL, flush_interval=FLUSH_INTERVAL,
+               thread_prefix="", memory_frames=MEMORY_FRAMES):
+    self.output = output
+    self.interval = interval
+    self.flush_interval = flush_interval
+
+    # only threads whose name starts with the prefix are sampled
+    self.thread_prefix = thread_prefix
+    self.memory_frames = memory_frames
+
+    # number of samples of every collapsed stack
+    self.stacks = {}
+    self.stacks_lock = threading.Lock()
+
+    # labels of the code objects seen so far
+    self.labels = {}
+
+    self.samples = 0
+    self.sampling_seconds = 0.0
+
+    # memory snapshot compared against by the next snapshot
+    self.last_snapshot = None
+    self.memory_lock = threading.Lock()
+
+    self.stop_event = threading.Event()
+
+    self.thread = threading.Thread(name="profiler_thread", target=self.run)
+    self.thread.daemon = True
+
+  def start(self):
+    self.thread.start()
+
+    # the last samples are written when the server exits
+    atexit.register(self.stop)
+
+  def stop(self):
+    if self.stop_event.is_set():
+      return
+
+    self.stop_event.set()
+    self.thread.join()
+
+    if tracemalloc.is_tracing():
+      tracemalloc.stop()
+
+  def run(self):
+    next_flush = time.time() + self.flush_interval
+
+    while not self.stop_event.wait(self.interval):
+      self.sample()
+
+      if time.time() >= next_flush:
+        self.flush()
+        next_flush = time.time() + self.flush_interval
+
+    self.flush()
+
+  def sample(self):
+    start = time.perf_counter()
+
+    names = {}
+
+    for thread in threading.enumerate():
+      if thread.name.startswith(self.thread_prefix) and thread is not self.thread:
+        names[thread.ident] = thread.name
+
+    samples = []
+
+    for ident, frame in sys._current_frames().items():
+      if not ident in names:
+        continue
+
+      labels = []
+
+      while frame is not None:
+        labels.append(self.label(frame.f_code))
+        frame = frame.f_back
+
+      labels.append(self.thread_label(names[ident]))
+      labels.reverse()
+
+      samples.append(";".join(labels))
+
+    with self.stacks_lock:
+      for stack in samples:
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+      self.samples += 1
+      self.sampling_seconds += time.perf_counter() - start
+
+  def label(self, code):
+    label = self.labels.get(code)
+
+    if label is None:
+      label = "%s (%s:%d)" % (code.co_name, os.path.basename(code.co_filename), code.co_firstlineno)
+      self.labels[code] = label
+
+    return label
+
+  def thread_label(self, name):
+    # pool threads are merged into one root so that their stacks add up
+    if name.startswith("Pyro-Worker"):
+      return "Pyro-Worker"
+
+    return name
+
+  def collapsed(self):
+    with self.stacks_lock:
+      stacks = sorted(self.stacks.items())
+
+    # one "frame;frame;frame count" line per stack, the input of flamegraph.pl and speedscope
+    return "".join("%s %d\n" % (stack, count) for stack, count in stacks)
+
+  def flush(self):
+    if self.output is None:
+      return
+
+    # replace the file at once so that readers never see a partial profile
+    temporary = self.output + ".tmp"
+
+    with open(temporary, 'w') as output:
+      output.write(self.collapsed())
+
+    os.replace(temporary, self.output)
+
+  def get_stats(self):
+    with self.stacks_lock:
+      return {
+        'samples': self.samples,
+        'stacks': len(self.stacks),
+        'sampling_seconds': self.sampling_seconds,
+        'memory_tracing': tracemalloc.is_tracing()
+      }
+
+  def snapshot_memory(self, limit=20):
+    with self.memory_lock:
+      # memory is only traced once a snapshot is asked for since tracing slows down allocations
+      if not tracemalloc.is_tracing():
+        tracemalloc.start(self.memory_frames)
+        self.last_snapshot = None
+
+        return {
+          'started': True,
+          'current_bytes': 0,
+          'peak_bytes': 0,
+          'top': [],
+          'growth': []
+        }
+
+      snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>")
+      ])
+
+      current, peak = tracemalloc.get_traced_memory()
+
+      top = [self.format_stat(stat) for stat in snapshot.statistics('lineno')[:limit]]
+      growth = []
+
+      # allocations that grew since the previous snapshot
+      if self.last_snapshot is not None:
+        for stat in snapshot.compare_to(self.last_snapshot, 'lineno')[:limit]:
+          growth.append(dict(self.format_stat(stat), size_diff=stat.size_diff, count_diff=stat.count_diff))
+
+      self.last_snapshot = snapshot
+
+      return {
+        'started': False,
+        'current_bytes': current,
+        'peak_bytes': peak,
+        'top': top,
+        'growth': growth
+      }
+
+  def stop_memory_tracing(self):
+    with self.memory_lock:
+      self.last_snapshot = None
+
+      if not tracemalloc.is_tracing():
+        return False
+
+      tracemalloc.stop()
+
+      return True
+
+  def format_stat(self, stat):
+    frame = stat.traceback[0]
+
+    return {
+      'location': "%s:%d" % (frame.filename, frame.lineno),
+      'size': stat.size,
+      'count': stat.count
+    }
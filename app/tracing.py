@@ -0,0 +1,189 @@
+# tracing.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import os
+import json
+import time
+import binascii
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+import Pyro4
+
+# number of spans kept. Older spans are dropped first
+DEFAULT_CAPACITY = 100000
+
+# pyro message annotation carrying the trace id and the span id of the caller
+TRACE_ANNOTATION = "TRCE"
+
+def new_id():
+  return binascii.hexlify(os.urandom(8)).decode('ascii')
+
+def encode_context(context):
+  return ("%s:%s" % context).encode('ascii')
+
+def decode_context(value):
+  trace_id, _, span_id = bytes(value).decode('ascii').partition(':')
+
+  return trace_id, span_id
+
+def remote_context():
+  # trace context sent by the client of the pyro call handled by this thread
+  context = getattr(Pyro4, 'current_context', None)
+  annotations = getattr(context, 'annotations', None)
+
+  if not annotations or not TRACE_ANNOTATION in annotations:
+    return None
+
+  return decode_context(annotations[TRACE_ANNOTATION])
+
+class Tracer(object):
+  """Records spans to a ring buffer and exports them as Chrome trace events."""
+
+  def __init__(self, capacity=DEFAULT_CAPACITY, process_name="blackjack"):
+    self.enabled = False
+    self.process_name = process_name
+
+    # appending to a bounded deque is thread safe and drops the oldest span
+    self.events = deque(maxlen=capacity)
+
+    # names of the threads that recorded spans
+    self.threads = {}
+
+    # open spans of the current thread
+    self.local = threading.local()
+
+    self.pid = os.getpid()
+
+  def enable(self, capacity=DEFAULT_CAPACITY, process_name=None):
+    if capacity != self.events.maxlen:
+      self.events = deque(self.events, maxlen=capacity)
+
+    if process_name is not None:
+      self.process_name = process_name
+
+    self.pid = os.getpid()
+    self.enabled = True
+
+  def disable(self):
+    self.enabled = False
+
+  def add_thread(self):
+    # names of exited threads are dropped so that pool threads coming and going don't add up
+    alive = set(thread.ident for thread in threading.enumerate())
+
+    for tid in list(self.threads):
+      if not tid in alive:
+        self.threads.pop(tid, None)
+
+    self.threads[threading.get_ident()] = threading.current_thread().name
+
+  def current(self):
+    stack = getattr(self.local, 'stack', None)
+
+    if not stack:
+      return None
+
+    return stack[-1]
+
+  @contextmanager
+  def span(self, name, category, context=None):
+    if self.enabled is False:
+      yield None
+      return
+
+    stack = getattr(self.local, 'stack', None)
+
+    if stack is None:
+      stack = []
+      self.local.stack = stack
+
+      self.add_thread()
+
+    # spans continue the trace of the enclosing span or of the given remote context
+    parent = context if context is not None else self.current()
+
+    trace_id = parent[0] if parent is not None else new_id()
+    span_id = new_id()
+
+    stack.append((trace_id, span_id))
+    start = time.time()
+
+    try:
+      yield (trace_id, span_id)
+    finally:
+      end = time.time()
+      stack.pop()
+
+      # wall clock timestamps so that client and server traces line up
+      self.events.append({
+        'name': name,
+        'cat': category,
+        'ph': 'X',
+        'ts': start * 1e6,
+        'dur': (end - start) * 1e6,
+        'pid': self.pid,
+        'tid': threading.get_ident(),
+        'args': {
+          'trace_id': trace_id,
+          'span_id': span_id,
+          'parent_id': parent[1] if parent is not None else None
+        }
+      })
+
+  def get_events(self):
+    events = [{
+      'name': 'process_name',
+      'ph': 'M',
+      'pid': self.pid,
+      'args': {'name': self.process_name}
+    }]
+
+    for tid, name in list(self.threads.items()):
+      events.append({
+        'name': 'thread_name',
+        'ph': 'M',
+        'pid': self.pid,
+        'tid': tid,
+        'args': {'name': name}
+      })
+
+    return events + list(self.events)
+
+  def dump(self, path, other_events=None):
+    events = self.get_events()
+
+    # events recorded by the other side of the connection
+    if other_events is not None:
+      events.extend(other_events)
+
+    with open(path, 'w') as output:
+      json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, output)
+
+# tracer of the process
+tracer = Tracer()
+
+def traced(category, name=None):
+  """Records the calls of the decorated function as spans when tracing is enabled."""
+
+  def decorate(function):
+    label = name if name is not None else function.__qualname__
+
+    @functools.wraps(function)
+    def call(*args, **kwargs):
+      if tracer.enabled is False:
+        return function(*args, **kwargs)
+
+      # the outermost span of a server thread continues the trace of the client
+      context = remote_context() if tracer.current() is None else None
+
+      with tracer.span(label, category, context):
+        return function(*args, **kwargs)
+
+    return call
+
+  return decorate
@@ -0,0 +1,148 @@
+# load.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import os
+import time
+import argparse
+import threading
+import multiprocessing
+import Pyro4
+from yaml import load as yaml_load
+from Pyro4.core import Proxy as PyroProxy
+from app.blackjack.game.bot import Bot, CallStats
+from app.blackjack.game.line_client import LineClient
+
+def percentile(values, fraction):
+  return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def create_client(settings):
+  if settings['transport'] == 'asyncio':
+    return LineClient(settings['host'], settings['port'])
+
+  return PyroProxy("PYRO:%s@%s:%d" % (settings['object_name'], settings['host'], settings['port']))
+
+def run_bots(settings, first_bot, bots):
+  # every bot of the process plays on its own thread and connection
+  Pyro4.config.SERIALIZER = settings['serializer']
+
+  stats = CallStats()
+  lock = threading.Lock()
+
+  def run_bot(index):
+    bot_stats = CallStats()
+
+    try:
+      client = create_client(settings)
+
+      Bot(client, "bot%d" % index, bot_stats, settings['stand_on'], settings['table_size']).play(settings['deadline'])
+    except Exception:
+      bot_stats.record('bot', 0.0, True)
+
+    with lock:
+      stats.merge(bot_stats)
+
+  threads = [threading.Thread(target=run_bot, args=(index,)) for index in range(first_bot, first_bot + bots)]
+
+  for thread in threads:
+    thread.start()
+
+  for thread in threads:
+    thread.join()
+
+  return stats
+
+def load_settings():
+  settings = {
+    'host': "localhost",
+    'port': 3000,
+    'object_name': "standard.manager",
+    'transport': "pyro",
+    'serializer': "serpent"
+  }
+
+  # connect the same way the game client does
+  config = os.path.join(os.getcwd(), "conf/main.yml")
+
+  if os.path.exists(config):
+    with open(config) as yaml_config:
+      config = yaml_load(yaml_config)
+
+    settings['host'] = config['app']['server']['host']
+    settings['port'] = config['app']['server']['port']
+    settings['object_name'] = config['app']['manager']['object_name']
+    settings['transport'] = config['app']['server']['transport']
+    settings['serializer'] = config['app']['server']['serializer']
+
+  return settings
+
+def main():
+  settings = load_settings()
+
+  parser = argparse.ArgumentParser(description="Play headless bots against a running server.py.")
+  parser.add_argument("--bots", type=int, default=100, help="number of bots")
+  parser.add_argument("--processes", type=int, default=os.cpu_count(), help="number of processes running the bots")
+  parser.add_argument("--duration", type=float, default=30, help="seconds the bots keep playing")
+  parser.add_argument("--stand-on", type=int, default=17, help="bots stop hitting at this total")
+  parser.add_argument("--table-size", type=int, default=4, help="players the bots wait for before a table starts")
+  parser.add_argument("--host", default=settings['host'], help="server host")
+  parser.add_argument("--port", type=int, default=settings['port'], help="server port")
+  parser.add_argument("--transport", choices=['pyro', 'asyncio'], default=settings['transport'],
+                      help="server transport")
+
+  args = parser.parse_args()
+
+  settings.update({
+    'host': args.host,
+    'port': args.port,
+    'transport': args.transport,
+    'stand_on': args.stand_on,
+    'table_size': args.table_size,
+    'deadline': time.time() + args.duration
+  })
+
+  # split the bots evenly over the processes
+  processes = max(1, min(args.processes, args.bots))
+  shards = []
+
+  for index in range(0, processes):
+    first_bot = index * args.bots // processes
+    shards.append((settings, first_bot, (index + 1) * args.bots // processes - first_bot))
+
+  start = time.time()
+
+  with multiprocessing.Pool(processes) as pool:
+    results = pool.starmap(run_bots, shards)
+
+  elapsed = time.time() - start
+
+  stats = CallStats()
+
+  for result in results:
+    stats.merge(result)
+
+  print("Bots: %d, Processes: %d, Transport: %s, Elapsed: %.2fs" % (args.bots, processes, args.transport, elapsed))
+  print("Hands: %d (%.1f/s), Rounds: %.0f (%.1f/s), Failed bots: %d, Failed joins: %d" %
+        (stats.hands, stats.hands / elapsed, stats.rounds, stats.rounds / elapsed, stats.errors.get('bot', 0),
+         stats.failed_joins))
+  print("")
+
+  print("%-22s %8s %8s %8s %9s %9s %9s %9s" %
+        ("method", "calls", "errors", "error %", "p50 (ms)", "p90 (ms)", "p99 (ms)", "max (ms)"))
+
+  for method in sorted(stats.latencies):
+    if method == 'bot':
+      continue
+
+    latencies = sorted(stats.latencies[method])
+    errors = stats.errors.get(method, 0)
+
+    print("%-22s %8d %8d %8.2f %9.2f %9.2f %9.2f %9.2f" %
+          (method, len(latencies), errors, 100.0 * errors / len(latencies),
+           percentile(latencies, 0.5) * 1000, percentile(latencies, 0.9) * 1000,
+           percentile(latencies, 0.99) * 1000, latencies[-1] * 1000))
+
+if __name__ == "__main__":
+  main()
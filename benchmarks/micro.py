@@ -0,0 +1,371 @@
+# micro.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import sys
+import json
+import time
+import timeit
+import platform
+import argparse
+from app.cards.card import Card
+from app.cards.deck import Deck
+from app.cards.error import DeckError
+from app.cards import transformer, sprite
+from app.blackjack.cards.card import Card as BlackJackCard
+from app.blackjack.cards.deck import SerializableDeck
+from app.blackjack.cards.shoe import SerializableShoe
+from app.blackjack.cards import transformer as blackjack_transformer
+from app.blackjack.cards import sprite as blackjack_sprite
+from app.blackjack.game.manager import Manager
+from app.blackjack.game.room import MAX_PLAYERS
+from app.cards.shoe import MAX_DECKS
+
+# player counts of the benchmarks of a single room. Counts above MAX_PLAYERS seat synthetic
+# players past the limit of the room, up to what a shoe of MAX_DECKS decks can deal
+ROOM_PLAYER_COUNTS = [1, 2, 3, 4, 16, 64]
+
+# player counts of the benchmarks of the whole room registry. Counts above MAX_PLAYERS fill several rooms
+REGISTRY_PLAYER_COUNTS = [1, 2, 3, 4, 16, 64, 256]
+
+# benchmarks are registered as (name, setup) where setup returns the function to time
+BENCHMARKS = []
+
+def benchmark(name):
+  def register(setup):
+    BENCHMARKS.append((name, setup))
+    return setup
+
+  return register
+
+# [Cards] ::start
+@benchmark("card.construct")
+def card_construct():
+  return lambda: Card("heart", "K")
+
+@benchmark("card.construct.blackjack")
+def blackjack_card_construct():
+  return lambda: BlackJackCard("heart", "K")
+
+@benchmark("card.get")
+def card_get():
+  return lambda: BlackJackCard.get("heart", "K")
+
+@benchmark("card.from_code")
+def card_from_code():
+  return lambda: BlackJackCard.from_code(37)
+
+@benchmark("card.get_normalized_value")
+def card_get_normalized_value():
+  card = BlackJackCard.get("heart", "K")
+
+  return card.get_normalized_value
+# [Cards] ::end
+
+# [Decks] ::start
+@benchmark("deck.create")
+def deck_create():
+  return Deck().create
+
+@benchmark("deck.shuffle")
+def deck_shuffle():
+  deck = Deck()
+  deck.create()
+
+  return deck.shuffle
+
+def refilling_pluck(deck, number_of_cards):
+  deck.create()
+
+  # the deck is created again when it runs out, the cost is spread over the plucks
+  def pluck():
+    try:
+      return deck.pluck(number_of_cards)
+    except (DeckError, IndexError):
+      deck.create()
+
+      return deck.pluck(number_of_cards)
+
+  return pluck
+
+@benchmark("deck.pluck")
+def deck_pluck():
+  return refilling_pluck(Deck(), 2)
+
+@benchmark("deck.pluck.serializable")
+def serializable_deck_pluck():
+  return refilling_pluck(SerializableDeck(), 2)
+
+@benchmark("shoe.create+shuffle.6_decks")
+def shoe_shuffle():
+  shoe = SerializableShoe(6)
+
+  def create_and_shuffle():
+    shoe.create()
+    shoe.shuffle()
+
+  return create_and_shuffle
+
+@benchmark("shoe.pluck")
+def shoe_pluck():
+  return refilling_pluck(SerializableShoe(6), 2)
+# [Decks] ::end
+
+# [Transformers] ::start
+def transform(transformer_class, value):
+  return lambda: transformer_class(value).transform()
+
+@benchmark("transformer.card_to_text")
+def card_to_text():
+  return transform(transformer.CardToTextTransformer, Card.get("heart", "K"))
+
+@benchmark("transformer.text_to_card")
+def text_to_card():
+  return transform(transformer.TextToCardTransformer, "K of heart")
+
+@benchmark("transformer.card_to_code")
+def card_to_code():
+  return transform(transformer.CardToCodeTransformer, Card.get("heart", "K"))
+
+@benchmark("transformer.code_to_card")
+def code_to_card():
+  return transform(transformer.CodeToCardTransformer, 37)
+
+@benchmark("transformer.card_to_image_position")
+def card_to_image_position():
+  return transform(sprite.CardToCardImagePositionTransformer, Card.get("heart", "K"))
+
+@benchmark("transformer.image_position_to_card")
+def image_position_to_card():
+  position = sprite.CardToCardImagePositionTransformer(Card.get("heart", "K")).transform()
+
+  return transform(sprite.CardImagePositionToCardTransformer, position)
+
+@benchmark("transformer.blackjack.text_to_card")
+def blackjack_text_to_card():
+  return transform(blackjack_transformer.TextToCardTransformer, "K of heart")
+
+@benchmark("transformer.blackjack.code_to_card")
+def blackjack_code_to_card():
+  return transform(blackjack_transformer.CodeToCardTransformer, 37)
+
+@benchmark("transformer.blackjack.image_position_to_card")
+def blackjack_image_position_to_card():
+  position = sprite.CardToCardImagePositionTransformer(Card.get("heart", "K")).transform()
+
+  return transform(blackjack_sprite.CardImagePositionToCardTransformer, position)
+# [Transformers] ::end
+
+# [Manager] ::start
+def create_room(players):
+  # the opening hands of the synthetic players need more than one deck
+  manager = Manager(1 if players <= MAX_PLAYERS else MAX_DECKS)
+  manager.logger = None
+
+  connections = [manager.connect("player%d" % index, None, True) for index in range(0, min(players, MAX_PLAYERS))]
+  room = manager.rooms[connections[0]['room_id']]
+
+  # seat the rest of the players in the same room
+  room.is_joinable = lambda: True
+
+  for index in range(MAX_PLAYERS, players):
+    manager.player_rooms[room.connect("player%d" % index, True)] = room.room_id
+
+  del room.is_joinable
+
+  manager.deal_round(room.room_id)
+
+  return manager, connections[0]['connection_uid'], room.room_id
+
+def create_rooms(players):
+  manager = Manager()
+  manager.logger = None
+
+  # rooms are filled up one after the other
+  connections = [manager.connect("player%d" % index, None, True) for index in range(0, players)]
+
+  for room_id in set(connection['room_id'] for connection in connections):
+    manager.deal_round(room_id)
+
+  return manager, connections[0]['connection_uid'], connections[0]['room_id']
+
+def manager_benchmark(player_counts, create):
+  def register(operation):
+    for players in player_counts:
+      def setup(players=players):
+        return operation(*create(players))
+
+      BENCHMARKS.append(("manager.%s[players=%d]" % (operation.__name__, players), setup))
+
+    return operation
+
+  return register
+
+# operations on one room, timed against a growing table
+room_benchmark = manager_benchmark(ROOM_PLAYER_COUNTS, create_room)
+
+# operations on the room registry, timed against a growing number of rooms
+registry_benchmark = manager_benchmark(REGISTRY_PLAYER_COUNTS, create_rooms)
+
+@room_benchmark
+def get_player_cards(manager, identifier, room_id):
+  return lambda: manager.get_player_cards(room_id)
+
+@room_benchmark
+def get_states(manager, identifier, room_id):
+  return lambda: manager.get_states(room_id)
+
+@room_benchmark
+def get_table_snapshot(manager, identifier, room_id):
+  return lambda: manager.get_table_snapshot(room_id)
+
+@room_benchmark
+def get_player_card_total(manager, identifier, room_id):
+  return lambda: manager.get_player_card_total(identifier)
+
+@registry_benchmark
+def get_rooms(manager, identifier, room_id):
+  return manager.get_rooms
+
+@room_benchmark
+def deal_round(manager, identifier, room_id):
+  # the round is already dealt so this times the path every client but the first takes
+  return lambda: manager.deal_round(room_id)
+
+@room_benchmark
+def hit(manager, identifier, room_id):
+  batch = [
+    {'method': 'draw_cards', 'args': [identifier, 1]},
+    {'method': 'get_player_card_total', 'args': [identifier]}
+  ]
+
+  def new_hand_and_hit():
+    room = manager.rooms[room_id]
+
+    # start over with a full shoe instead of running out of cards
+    if room.deck.get_remaining_cards() < 10:
+      room.deck.create()
+      room.deck.shuffle()
+
+    manager.new_game(identifier)
+
+    return manager.execute(batch)
+
+  return new_hand_and_hit
+
+@registry_benchmark
+def connect_and_disconnect(manager, identifier, room_id):
+  def connect_and_disconnect():
+    connection = manager.connect("visitor")
+
+    if connection is not False:
+      manager.disconnect(connection['connection_uid'])
+
+  return connect_and_disconnect
+# [Manager] ::end
+
+def measure(function, repeat, min_time):
+  timer = timeit.Timer(function)
+
+  # calls per run so that each run takes at least min_time
+  number = 1
+
+  while timer.timeit(number) < min_time:
+    number *= 2
+
+  runs = sorted(run / number for run in timer.repeat(repeat, number))
+
+  return {
+    'best_ns': runs[0] * 1e9,
+    'median_ns': runs[len(runs) // 2] * 1e9,
+    'number': number
+  }
+
+def run(args):
+  results = {}
+
+  for name, setup in BENCHMARKS:
+    if args.filter is not None and not args.filter in name:
+      continue
+
+    results[name] = measure(setup(), args.repeat, args.min_time)
+
+    print("%-55s %12.0f ns" % (name, results[name]['best_ns']))
+
+  report = {
+    'meta': {
+      'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+      'python': platform.python_version(),
+      'platform': platform.platform(),
+      'repeat': args.repeat
+    },
+    'results': results
+  }
+
+  if args.output is not None:
+    with open(args.output, 'w') as output:
+      json.dump(report, output, indent=2, sort_keys=True)
+
+    print("Results saved to %s" % args.output)
+
+  return 0
+
+def compare(args):
+  with open(args.base) as base_file:
+    base = json.load(base_file)['results']
+
+  with open(args.new) as new_file:
+    new = json.load(new_file)['results']
+
+  regressions = 0
+
+  print("%-55s %12s %12s %9s" % ("benchmark", "base (ns)", "new (ns)", "change"))
+
+  for name in sorted(set(base) & set(new)):
+    change = new[name]['best_ns'] / base[name]['best_ns'] - 1
+    flag = ""
+
+    if change > args.threshold:
+      flag = "REGRESSION"
+      regressions += 1
+    elif change < -args.threshold:
+      flag = "improved"
+
+    print("%-55s %12.0f %12.0f %+8.1f%% %s" % (name, base[name]['best_ns'], new[name]['best_ns'], change * 100, flag))
+
+  for name in sorted(set(base) ^ set(new)):
+    print("%-55s only in %s" % (name, args.base if name in base else args.new))
+
+  print("")
+  print("%d regression(s) above %.0f%%" % (regressions, args.threshold * 100))
+
+  # a failing exit code lets the comparison gate a deployment
+  return 1 if regressions > 0 else 0
+
+def main():
+  parser = argparse.ArgumentParser(description="Microbenchmarks of the cards, decks, transformers and manager.")
+  commands = parser.add_subparsers(dest="command")
+  commands.required = True
+
+  run_parser = commands.add_parser("run", help="run the benchmarks")
+  run_parser.add_argument("--output", default=None, help="JSON file for the results")
+  run_parser.add_argument("--filter", default=None, help="only run benchmarks containing this text")
+  run_parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+  run_parser.add_argument("--min-time", type=float, default=0.05, help="shortest duration of a run in seconds")
+  run_parser.set_defaults(handler=run)
+
+  compare_parser = commands.add_parser("compare", help="compare two saved runs")
+  compare_parser.add_argument("base", help="JSON results of the baseline")
+  compare_parser.add_argument("new", help="JSON results of the change")
+  compare_parser.add_argument("--threshold", type=float, default=0.10,
+                              help="slowdown flagged as a regression (0.10 = 10%%)")
+  compare_parser.set_defaults(handler=compare)
+
+  args = parser.parse_args()
+
+  sys.exit(args.handler(args))
+
+if __name__ == "__main__":
+  main()
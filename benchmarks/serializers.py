@@ -0,0 +1,95 @@
+# serializers.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import time
+import argparse
+from Pyro4.util import get_serializer
+from Pyro4.errors import PyroError
+from app.blackjack.game.manager import Manager
+from app.blackjack.game.server import SERIALIZERS
+
+def sample_responses():
+  manager = Manager()
+  manager.logger = None
+
+  # a full table in the middle of a round
+  connections = [manager.connect("player%d" % index, None, True) for index in range(0, 4)]
+
+  players = [connection['connection_uid'] for connection in connections]
+  room_id = connections[0]['room_id']
+
+  manager.deal_round(room_id)
+
+  for identifier in players[:2]:
+    manager.draw_cards(identifier, 1)
+
+  return {
+    'get_player_cards': manager.get_player_cards(room_id),
+    'get_states': manager.get_states(room_id),
+    'get_table_snapshot': manager.get_table_snapshot(room_id),
+    'wait_for_events': manager.wait_for_events(room_id, 0, 0),
+    'deal_round': manager.deal_round(room_id),
+    'get_player_odds': manager.get_player_odds(players[0]),
+    'execute': manager.execute([
+      {'method': 'draw_cards', 'args': [players[2], 1]},
+      {'method': 'get_player_card_total', 'args': [players[2]]}
+    ])
+  }
+
+def measure(function, iterations):
+  # best of a few runs to keep scheduler noise out of the numbers
+  best = None
+
+  for _ in range(0, 3):
+    start = time.perf_counter()
+
+    for _ in range(0, iterations):
+      function()
+
+    elapsed = (time.perf_counter() - start) / iterations
+
+    if best is None or elapsed < best:
+      best = elapsed
+
+  return best
+
+def main():
+  parser = argparse.ArgumentParser(description="Measure the encode/decode cost and payload size of manager responses.")
+  parser.add_argument("--iterations", type=int, default=2000, help="encode and decode calls per measurement")
+  parser.add_argument("--serializers", nargs="+", default=SERIALIZERS, help="serializers to compare")
+
+  args = parser.parse_args()
+
+  responses = sample_responses()
+
+  print("%-20s %-10s %10s %12s %12s" % ("response", "serializer", "bytes", "encode (us)", "decode (us)"))
+
+  for name in args.serializers:
+    try:
+      serializer = get_serializer(name)
+    except PyroError as error:
+      print("%s is not available: %s" % (name, error))
+      continue
+
+    totals = [0, 0.0, 0.0]
+
+    for response_name, response in responses.items():
+      data, _ = serializer.serializeData(response)
+
+      encode = measure(lambda: serializer.serializeData(response), args.iterations)
+      decode = measure(lambda: serializer.deserializeData(data), args.iterations)
+
+      totals[0] += len(data)
+      totals[1] += encode
+      totals[2] += decode
+
+      print("%-20s %-10s %10d %12.2f %12.2f" % (response_name, name, len(data), encode * 1e6, decode * 1e6))
+
+    print("%-20s %-10s %10d %12.2f %12.2f" % ("total", name, totals[0], totals[1] * 1e6, totals[2] * 1e6))
+    print("")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,121 @@
+# startup.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+# modules of the game client that the server should never load
+CLIENT_ONLY_MODULES = [
+  'PIL',
+  'tkinter',
+  'app.cards.sprite',
+  'app.blackjack.cards.sprite',
+  'app.blackjack.game.tkwindow'
+]
+
+# entry points measured. "python" is the bare interpreter that the others are compared to
+ENTRY_POINTS = [
+  ('python', None),
+  ('server.py', 'server'),
+  ('game.py', 'game')
+]
+
+# runs in a fresh interpreter for every measurement
+PROBE = """
+import sys
+import time
+import json
+import resource
+
+start = time.perf_counter()
+
+if sys.argv[1] != "":
+  __import__(sys.argv[1])
+
+print(json.dumps({
+  'import_seconds': time.perf_counter() - start,
+  'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+  'modules': len(sys.modules),
+  'client_only': [name for name in sys.argv[2:] if name in sys.modules]
+}))
+"""
+
+def measure(module, runs):
+  samples = []
+
+  for _ in range(0, runs):
+    output = subprocess.check_output([sys.executable, "-c", PROBE, module or ""] + CLIENT_ONLY_MODULES,
+                                     cwd=os.getcwd())
+    samples.append(json.loads(output.decode('utf-8')))
+
+  samples.sort(key=lambda sample: sample['import_seconds'])
+
+  # the median run, the cold first import is as likely to be the slowest as any other
+  return samples[len(samples) // 2]
+
+def slowest_imports(module, count):
+  # -X importtime writes "import time: self [us] | cumulative | imported package" to stderr
+  result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import %s" % module],
+                          cwd=os.getcwd(), stderr=subprocess.PIPE, stdout=subprocess.DEVNULL)
+
+  imports = []
+
+  for line in result.stderr.decode('utf-8').splitlines():
+    fields = line.split("|")
+
+    if len(fields) != 3 or not fields[1].strip().isdigit():
+      continue
+
+    imports.append((int(fields[1]), fields[2].strip()))
+
+  return sorted(imports, reverse=True)[:count]
+
+def main():
+  parser = argparse.ArgumentParser(description="Import time and memory of server.py and game.py in fresh interpreters.")
+  parser.add_argument("--runs", type=int, default=9, help="fresh interpreters per entry point")
+  parser.add_argument("--top", type=int, default=0, help="also list the slowest imports of each entry point")
+  args = parser.parse_args()
+
+  # the entry points import the app package from the project root
+  if not os.path.exists(os.path.join(os.getcwd(), "server.py")):
+    print("Run from the project root: python -m benchmarks.startup")
+    return 2
+
+  print("%-12s %12s %10s %9s  %s" % ("entry point", "import (ms)", "RSS (MB)", "modules", "client only modules"))
+
+  results = {}
+
+  for name, module in ENTRY_POINTS:
+    results[name] = measure(module, args.runs)
+
+    print("%-12s %12.1f %10.1f %9d  %s" % (name, results[name]['import_seconds'] * 1000,
+                                          results[name]['rss_kb'] / 1024.0, results[name]['modules'],
+                                          ", ".join(results[name]['client_only']) or "-"))
+
+  if args.top > 0:
+    for name, module in ENTRY_POINTS:
+      if module is None:
+        continue
+
+      print("")
+      print("Slowest imports of %s (cumulative ms)" % name)
+
+      for cumulative, imported in slowest_imports(module, args.top):
+        print("  %9.1f  %s" % (cumulative / 1000.0, imported))
+
+  # a failing exit code catches client modules that find their way into the server again
+  if len(results['server.py']['client_only']) > 0:
+    print("")
+    print("server.py loads client only modules: %s" % ", ".join(results['server.py']['client_only']))
+    return 1
+
+  return 0
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -7,9 +7,11 @@
 # Version 2.0.0
 
 import os
+import Pyro4
 from yaml import load as yaml_load
 from app.logger import Logger
-from Pyro4.core import Proxy as PyroProxy
+from app.tracing import tracer
+from app.blackjack.game.proxy_pool import ProxyPool
 from app.blackjack.game.tkwindow import Window as GameWindow
 
 def main():
@@ -26,16 +28,26 @@ def main():
     # store the refernce to the config
     config = yaml_load(yaml_config)
 
+    # record spans of the client and send the trace context with every call
+    if config['app']['tracing']['enabled'] is True:
+      tracer.enable(config['app']['tracing']['capacity'], "client")
+
+    # use the same wire format as the server
+    Pyro4.config.SERIALIZER = config['app']['server']['serializer']
+
     # PYRO:standard.deck@localhost:3000
-    game_manager = PyroProxy("PYRO:%s@%s:%d" % (config['app']['manager']['object_name'],
-                                                config['app']['server']['host'],
-                                                config['app']['server']['port']))
+    proxies = ProxyPool("PYRO:%s@%s:%d" % (config['app']['manager']['object_name'],
+                                           config['app']['server']['host'],
+                                           config['app']['server']['port']))
 
-    # set the game deck
-    window.set_game_manager(game_manager)
+    # set the game manager connections
+    window.set_proxy_pool(proxies)
 
     # enable logging
-    window.set_logger(Logger("BlackJack Client"))
+    window.set_logger(Logger("BlackJack Client",
+                             config['app']['logging']['level'],
+                             config['app']['logging']['structured'],
+                             config['app']['logging']['queue_size']))
 
     # close the file since we do not need it anymore
     yaml_config.close()
@@ -43,6 +55,22 @@ def main():
   # start application
   window.bootstrap()
 
+  if tracer.enabled is True:
+    save_trace(window, config['app']['tracing']['output'])
+
+def save_trace(window, path):
+  server_events = None
+
+  # the server spans are added to the same file when the server can be reached
+  try:
+    server_events = window.game_manager.get_trace_events()
+  except Exception:
+    pass
+
+  tracer.dump(path, server_events)
+
+  print("Trace saved to %s" % path)
+
 if __name__ == "__main__":
   main()
 
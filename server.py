@@ -9,14 +9,17 @@
 import os
 from yaml import load as yaml_load
 from app.blackjack.game.server import Server
+from app.blackjack.game.manager import Manager
+from app.metrics import MetricsExporter
+from app.tracing import tracer
+from app.logger import Logger
+from app.profiler import Profiler
+from app.blackjack.game.admin import Admin, AdminServer
 
 def main():
   # application configuration
   config = os.path.join(os.getcwd(), "conf/main.yml")
 
-  # create an instance of the server
-  server = Server()
-
   # override the default server settings when yaml file exists
   if os.path.exists(config):
     # open the file and store to the yaml_config variable
@@ -25,6 +28,26 @@ def main():
     # store the refernce to the config
     config = yaml_load(yaml_config)
 
+    # create the game manager with the configured shoe and rooms
+    game_manager = Manager(config['app']['manager']['decks'],
+                           config['app']['manager']['penetration'],
+                           config['app']['manager']['max_rooms'])
+
+    # log through the configured level and format. Replaced before any room takes the logger
+    game_manager.logger = Logger("BlackJack State Manager",
+                                 config['app']['logging']['level'],
+                                 config['app']['logging']['structured'],
+                                 config['app']['logging']['queue_size'])
+
+    # serve the manager through the configured transport
+    if config['app']['server']['transport'] == 'asyncio':
+      # only the asyncio transport loads asyncio
+      from app.blackjack.game.async_server import AsyncServer
+
+      server = AsyncServer(game_manager)
+    else:
+      server = Server(game_manager)
+
     # set the server host
     server.set_host(config['app']['server']['host'])
 
@@ -34,10 +57,48 @@ def main():
     # close the file since we do not need it anymore
     yaml_config.close()
 
-    # start the server with custom deck name
-    server.start(config['app']['manager']['object_name'])
+    # record spans that the game client collects through get_trace_events()
+    if config['app']['tracing']['enabled'] is True:
+      tracer.enable(config['app']['tracing']['capacity'], "server")
+
+    # sample the server threads for as long as the server runs
+    if config['app']['profiling']['enabled'] is True:
+      profiler = Profiler(config['app']['profiling']['output'],
+                          config['app']['profiling']['interval'],
+                          config['app']['profiling']['flush_interval'],
+                          config['app']['profiling']['threads'])
+      profiler.start()
+
+      # the profile and memory snapshots are served apart from the game clients
+      admin_server = AdminServer(Admin(profiler))
+      admin_server.set_host(config['app']['profiling']['admin_host'])
+      admin_server.set_port(config['app']['profiling']['admin_port'])
+      admin_server.start(config['app']['profiling']['admin_object_name'])
+
+    # serve the metrics of the manager over http
+    if config['app']['metrics']['http_enabled'] is True:
+      MetricsExporter(game_manager.metrics,
+                      config['app']['metrics']['http_host'],
+                      config['app']['metrics']['http_port']).start()
+
+    if config['app']['server']['transport'] == 'asyncio':
+      # threads running the operations that take room locks
+      server.set_worker_threads(config['app']['server']['threadpool_size'])
+
+      server.start()
+    else:
+      # set the pyro server type and the number of worker threads
+      server.set_server_type(config['app']['server']['type'])
+      server.set_threadpool_size(config['app']['server']['threadpool_size'])
+
+      # wire format of the manager calls
+      server.set_serializer(config['app']['server']['serializer'])
+
+      # start the server with custom deck name
+      server.start(config['app']['manager']['object_name'])
   else:
     # start the server default settings
+    server = Server()
     server.start()
 
 if __name__ == "__main__":
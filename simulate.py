@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+
+# simulate.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import time
+import argparse
+from app.blackjack.simulation.engine import DEFAULT_PLAYERS
+from app.blackjack.simulation.runner import ShardedRunner
+
+def main():
+  parser = argparse.ArgumentParser(description="Simulate headless blackjack rounds.")
+  parser.add_argument("--rounds", type=int, default=1000000, help="number of rounds to play")
+  parser.add_argument("--players", type=int, default=DEFAULT_PLAYERS, help="number of players per round")
+  parser.add_argument("--decks", type=int, default=1, help="number of decks in the shoe")
+  parser.add_argument("--stand-on", type=int, default=17, help="players stop hitting at this total")
+  parser.add_argument("--batch-size", type=int, default=100000, help="rounds played per array operation")
+  parser.add_argument("--seed", type=int, default=None, help="seed for reproducible results")
+  parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: all cores)")
+
+  args = parser.parse_args()
+
+  runner = ShardedRunner(args.workers, args.seed)
+
+  start = time.perf_counter()
+  result = runner.run(args.rounds, args.players, args.decks, args.stand_on, args.batch_size)
+  elapsed = time.perf_counter() - start
+
+  # results are identical for the same seed and number of workers
+  print("Seed: %d, Workers: %d" % (runner.get_seed(), runner.workers))
+
+  print("Rounds: %d (%d hands) in %.2fs - %.0f hands/s" %
+        (result.rounds, result.rounds * result.players, elapsed, (result.rounds * result.players) / elapsed))
+
+  for player in range(0, result.players):
+    print("Seat %d: win rate %.4f, bust rate %.4f" %
+          (player + 1, result.wins[player] / result.rounds, result.busts[player] / result.rounds))
+
+  print("No winner: %.4f, Ties: %.4f" %
+        (result.no_winner_rounds / result.rounds, result.tied_rounds / result.rounds))
+
+if __name__ == "__main__":
+  main()
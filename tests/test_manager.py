@@ -0,0 +1,132 @@
+# test_manager.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import threading
+import unittest
+from app.blackjack.game.manager import Manager
+
+class ExecuteTest(unittest.TestCase):
+
+  def setUp(self):
+    self.manager = Manager()
+    self.manager.logger = None
+
+    connection = self.manager.connect("alice", None, True)
+
+    self.identifier = connection['connection_uid']
+    self.room_id = connection['room_id']
+
+  def assertBatchError(self, response, index, method, results=None):
+    self.assertEqual(response['results'], results if results is not None else [])
+    self.assertIsNotNone(response['error'])
+    self.assertEqual(response['error']['index'], index)
+    self.assertEqual(response['error']['method'], method)
+    self.assertEqual(response['error']['type'], 'GameError')
+
+  def cards_on_hand(self):
+    return self.manager.get_states(self.room_id)[self.identifier].get('cards_on_hand', [])
+
+  def test_results_are_returned_in_order(self):
+    response = self.manager.execute([
+      {'method': 'draw_cards', 'args': [self.identifier, 2]},
+      {'method': 'get_player_card_total', 'args': [self.identifier]},
+      {'method': 'player_count', 'args': [self.room_id]}
+    ])
+
+    self.assertIsNone(response['error'])
+    self.assertEqual(len(response['results']), 3)
+    self.assertEqual(len(response['results'][0]), 2)
+    self.assertEqual(response['results'][1], self.manager.get_player_card_total(self.identifier))
+    self.assertEqual(response['results'][2], 1)
+
+  def test_keyword_arguments_are_passed(self):
+    response = self.manager.execute([
+      {'method': 'draw_cards', 'args': [self.identifier], 'kwargs': {'number_of_cards': 3}}
+    ])
+
+    self.assertIsNone(response['error'])
+    self.assertEqual(len(response['results'][0]), 3)
+
+  def test_batch_should_be_a_list(self):
+    for batch in [None, "draw_cards", {'method': 'draw_cards', 'args': [self.identifier]}]:
+      self.assertBatchError(self.manager.execute(batch), 0, None)
+
+  def test_operations_should_be_dictionaries_with_a_method(self):
+    self.assertBatchError(self.manager.execute([["draw_cards", self.identifier]]), 0, None)
+    self.assertBatchError(self.manager.execute([{'args': [self.identifier]}]), 0, None)
+
+  def test_only_batch_methods_are_allowed(self):
+    for method in ['connect', 'disconnect', 'execute', 'get_metrics', '_get_room']:
+      self.assertBatchError(self.manager.execute([{'method': method, 'args': [self.identifier]}]), 0, method)
+
+  def test_argument_types_are_checked(self):
+    response = self.manager.execute([{'method': 'draw_cards', 'args': self.identifier}])
+    self.assertBatchError(response, 0, 'draw_cards')
+
+    response = self.manager.execute([{'method': 'draw_cards', 'args': [self.identifier], 'kwargs': [1]}])
+    self.assertBatchError(response, 0, 'draw_cards')
+
+  def test_operations_need_a_player_or_room(self):
+    self.assertBatchError(self.manager.execute([{'method': 'get_states'}]), 0, 'get_states')
+
+  def test_batch_is_validated_before_anything_runs(self):
+    response = self.manager.execute([
+      {'method': 'draw_cards', 'args': [self.identifier, 2]},
+      {'method': 'disconnect', 'args': [self.identifier]}
+    ])
+
+    self.assertBatchError(response, 1, 'disconnect')
+    self.assertEqual(self.cards_on_hand(), [])
+
+  def test_batch_stops_at_the_first_failing_operation(self):
+    response = self.manager.execute([
+      {'method': 'draw_cards', 'args': [self.identifier, 1]},
+      {'method': 'get_states', 'args': [self.room_id + 1000]},
+      {'method': 'draw_cards', 'args': [self.identifier, 1]}
+    ])
+
+    self.assertEqual(len(response['results']), 1)
+    self.assertBatchError(response, 1, 'get_states', response['results'])
+    self.assertEqual(response['error']['message'], "Room: %s does not exist" % (self.room_id + 1000))
+
+    # the operations before the failing one stay applied
+    self.assertEqual(self.cards_on_hand(), response['results'][0])
+
+  def test_rooms_are_unlocked_after_a_failure(self):
+    self.manager.execute([
+      {'method': 'draw_cards', 'args': [self.identifier, 1]},
+      {'method': 'get_states', 'args': [self.room_id + 1000]}
+    ])
+
+    room = self.manager.rooms[self.room_id]
+    acquired = []
+
+    def try_lock():
+      if room.lock.acquire(timeout=1):
+        acquired.append(True)
+        room.lock.release()
+
+    # the room lock is reentrant so it has to be tried from another thread
+    thread = threading.Thread(target=try_lock)
+    thread.start()
+    thread.join()
+
+    self.assertEqual(acquired, [True])
+
+  def test_operations_are_measured_as_part_of_the_batch(self):
+    self.manager.execute([
+      {'method': 'draw_cards', 'args': [self.identifier, 1]},
+      {'method': 'get_player_card_total', 'args': [self.identifier]}
+    ])
+
+    latencies = self.manager.get_metrics()['histograms']['rpc_seconds']
+
+    self.assertEqual(latencies['execute']['count'], 1)
+    self.assertNotIn('draw_cards', latencies)
+    self.assertNotIn('get_player_card_total', latencies)
+
+if __name__ == "__main__":
+  unittest.main()
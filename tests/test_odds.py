@@ -0,0 +1,161 @@
+# test_odds.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import unittest
+from app.blackjack.cards.card import Card, RANK_COUNT
+from app.blackjack.cards.shoe import Shoe
+from app.blackjack.game.hand import Hand
+from app.blackjack.game.error import GameError
+from app.blackjack.game.odds import OddsCalculator, TranspositionTable, WINNING_NUMBER
+
+def composition_of(cards):
+  composition = [0] * RANK_COUNT
+
+  for card in cards:
+    composition[card.get_rank_index()] += 1
+
+  return tuple(composition)
+
+def hand_of(cards):
+  hand = Hand()
+
+  for card in cards:
+    hand.add(card)
+
+  return hand
+
+def reference_distribution(hand_cards, deck_cards, stand_on):
+  # draws every remaining card in turn and scores the hands with Hand, without memoization
+  total = hand_of(hand_cards).get_total()
+
+  if total >= stand_on or len(deck_cards) == 0:
+    return {total: 1.0}
+
+  distribution = {}
+
+  for index, card in enumerate(deck_cards):
+    outcomes = reference_distribution(hand_cards + [card], deck_cards[:index] + deck_cards[index + 1:], stand_on)
+
+    for final_total, probability in outcomes.items():
+      distribution[final_total] = distribution.get(final_total, 0.0) + probability / len(deck_cards)
+
+  return distribution
+
+def full_composition(decks=1):
+  shoe = Shoe(decks)
+  shoe.create()
+
+  return shoe.get_composition()
+
+class OddsCalculatorTest(unittest.TestCase):
+
+  def setUp(self):
+    self.odds = OddsCalculator()
+
+  def test_distributions_sum_to_one(self):
+    for decks in [1, 6]:
+      composition = full_composition(decks)
+
+      for card_total, ace_count in [(0, 0), (2, 0), (12, 0), (6, 1), (0, 2), (16, 0)]:
+        for stand_on in [12, 17, WINNING_NUMBER]:
+          distribution = self.odds.final_total_distribution(card_total, ace_count, composition, stand_on)
+
+          self.assertAlmostEqual(sum(distribution.values()), 1.0, places=9)
+
+  def test_distribution_matches_drawing_every_card(self):
+    deck_cards = [Card.get("heart", face_value) for face_value in ['A', 'A', '2', '5', '5', '6', 'K', '10']]
+
+    for hand_cards, stand_on in [
+      ([Card.get("spade", "7")], 17),
+      ([Card.get("spade", "A")], 17),
+      ([Card.get("spade", "9"), Card.get("spade", "3")], 19),
+      ([], WINNING_NUMBER)
+    ]:
+      hand = hand_of(hand_cards)
+
+      distribution = self.odds.final_total_distribution(hand.card_total, hand.ace_count,
+                                                        composition_of(deck_cards), stand_on)
+      expected = reference_distribution(hand_cards, deck_cards, stand_on)
+
+      self.assertEqual(sorted(distribution), sorted(expected))
+
+      for total, probability in expected.items():
+        self.assertAlmostEqual(distribution[total], probability, places=12)
+
+  def test_standing_hand_keeps_its_total(self):
+    self.assertEqual(self.odds.final_total_distribution(18, 0, full_composition()), {18: 1.0})
+
+    # soft 18, an ace counted as 11
+    self.assertEqual(self.odds.final_total_distribution(7, 1, full_composition()), {18: 1.0})
+
+  def test_empty_deck_keeps_the_total(self):
+    self.assertEqual(self.odds.final_total_distribution(5, 0, (0,) * RANK_COUNT), {5: 1.0})
+    self.assertEqual(self.odds.bust_probability(20, 0, (0,) * RANK_COUNT), 0.0)
+
+  def test_bust_probability_of_the_next_card(self):
+    composition = full_composition()
+
+    # only an ace keeps a hard 20 from busting
+    self.assertAlmostEqual(self.odds.bust_probability(20, 0, composition), 48 / 52)
+
+    # nothing busts a hand of aces
+    self.assertEqual(self.odds.bust_probability(0, 1, composition), 0.0)
+
+  def test_odds_report(self):
+    composition = full_composition()
+    odds = self.odds.get_odds(14, 0, composition)
+    distribution = self.odds.final_total_distribution(14, 0, composition)
+
+    self.assertEqual(odds['totals'], [[total, distribution[total]] for total in sorted(distribution)])
+    self.assertAlmostEqual(odds['final_bust_probability'],
+                           sum(probability for total, probability in distribution.items() if total > WINNING_NUMBER))
+    self.assertEqual(odds['bust_probability'], self.odds.bust_probability(14, 0, composition))
+
+  def test_positions_are_memoized(self):
+    composition = full_composition()
+
+    first = self.odds.final_total_distribution(4, 0, composition)
+    entries = self.odds.table.get_stats()['entries']
+
+    second = self.odds.final_total_distribution(4, 0, composition)
+    stats = self.odds.table.get_stats()
+
+    self.assertEqual(first, second)
+    self.assertGreater(entries, 0)
+    self.assertEqual(stats['entries'], entries)
+    self.assertGreater(stats['hits'], 0)
+
+  def test_stand_on_values_are_checked(self):
+    composition = full_composition()
+
+    for stand_on in [0, -1, WINNING_NUMBER + 1, 60, '17', 17.0, True]:
+      self.assertRaises(GameError, OddsCalculator, stand_on)
+      self.assertRaises(GameError, self.odds.final_total_distribution, 4, 0, composition, stand_on)
+      self.assertRaises(GameError, self.odds.get_odds, 4, 0, composition, stand_on)
+
+    for stand_on in [1, 17, WINNING_NUMBER]:
+      self.assertEqual(OddsCalculator(stand_on).stand_on, stand_on)
+
+class TranspositionTableTest(unittest.TestCase):
+
+  def test_least_recently_used_entries_are_evicted(self):
+    table = TranspositionTable(2)
+
+    table.put('a', 1)
+    table.put('b', 2)
+    table.get('a')
+    table.put('c', 3)
+
+    self.assertEqual(table.get('a'), 1)
+    self.assertIsNone(table.get('b'))
+    self.assertEqual(table.get('c'), 3)
+    self.assertEqual(table.get_stats()['entries'], 2)
+
+  def test_needs_room_for_an_entry(self):
+    self.assertRaises(GameError, TranspositionTable, 0)
+
+if __name__ == "__main__":
+  unittest.main()
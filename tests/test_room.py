@@ -0,0 +1,211 @@
+# test_room.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import random
+import unittest
+from app.cards.pipeline import ShuffleWorker
+from app.blackjack.game.room import Room, MAX_PLAYERS, EVENT_BUFFER_SIZE
+
+def apply_snapshot(table, snapshot):
+  # same as GameWindow.refresh_table()
+  if snapshot['is_full'] is True:
+    table['players'] = {}
+
+  table['players'].update(snapshot['players'])
+
+  for identifier in snapshot['removed']:
+    table['players'].pop(identifier, None)
+
+  if 'room' in snapshot:
+    table['room'] = snapshot['room']
+
+  table['version'] = snapshot['version']
+
+  return table
+
+class TableSnapshotTest(unittest.TestCase):
+
+  @classmethod
+  def setUpClass(cls):
+    # one background thread for the spare shoes of every room of the tests
+    cls.shuffle_worker = ShuffleWorker()
+
+  def create_room(self):
+    return Room(1, shuffle_worker=self.shuffle_worker)
+
+  def test_first_snapshot_is_full(self):
+    room = self.create_room()
+    key = room.connect("alice", True)
+
+    snapshot = room.get_table_snapshot(0)
+
+    self.assertTrue(snapshot['is_full'])
+    self.assertEqual(snapshot['version'], room.get_event_seq())
+    self.assertEqual(list(snapshot['players']), [key])
+    self.assertEqual(snapshot['room']['player_uids'], [key])
+    self.assertEqual(snapshot['removed'], [])
+
+  def test_snapshot_of_current_version_is_empty(self):
+    room = self.create_room()
+    room.connect("alice", True)
+
+    snapshot = room.get_table_snapshot(room.get_event_seq())
+
+    self.assertFalse(snapshot['is_full'])
+    self.assertEqual(snapshot['players'], {})
+    self.assertEqual(snapshot['removed'], [])
+    self.assertNotIn('room', snapshot)
+
+  def test_delta_only_holds_changed_players(self):
+    room = self.create_room()
+    alice = room.connect("alice", True)
+    bob = room.connect("bob", True)
+    version = room.get_event_seq()
+
+    room.draw_cards(bob, 1)
+
+    snapshot = room.get_table_snapshot(version)
+
+    self.assertFalse(snapshot['is_full'])
+    self.assertEqual(list(snapshot['players']), [bob])
+    self.assertEqual(len(snapshot['players'][bob]['cards']), 1)
+    self.assertNotIn(alice, snapshot['players'])
+
+    # drawing cards changes no room wide state
+    self.assertNotIn('room', snapshot)
+
+  def test_round_events_change_every_player(self):
+    room = self.create_room()
+    alice = room.connect("alice", True)
+    bob = room.connect("bob", True)
+    version = room.get_event_seq()
+
+    room.deal_round()
+
+    snapshot = room.get_table_snapshot(version)
+
+    self.assertEqual(sorted(snapshot['players']), sorted([alice, bob]))
+
+  def test_departures_are_removed(self):
+    room = self.create_room()
+    alice = room.connect("alice", True)
+    bob = room.connect("bob", True)
+    version = room.get_event_seq()
+
+    room.disconnect(bob)
+
+    snapshot = room.get_table_snapshot(version)
+
+    self.assertFalse(snapshot['is_full'])
+    self.assertEqual(snapshot['removed'], [bob])
+    self.assertEqual(snapshot['room']['player_uids'], [alice])
+
+  def test_departures_before_the_version_are_not_removed_again(self):
+    room = self.create_room()
+    room.connect("alice", True)
+    bob = room.connect("bob", True)
+
+    room.disconnect(bob)
+
+    snapshot = room.get_table_snapshot(room.get_event_seq())
+
+    self.assertEqual(snapshot['removed'], [])
+
+  def test_version_ahead_of_the_room_is_full(self):
+    room = self.create_room()
+    room.connect("alice", True)
+
+    # e.g. a client that kept its version across a server restart
+    snapshot = room.get_table_snapshot(room.get_event_seq() + 10)
+
+    self.assertTrue(snapshot['is_full'])
+    self.assertEqual(snapshot['version'], room.get_event_seq())
+
+  def test_version_behind_the_horizon_is_full(self):
+    room = self.create_room()
+    alice = room.connect("alice", True)
+    bob = room.connect("bob", True)
+    version = room.get_event_seq()
+
+    room.disconnect(bob)
+
+    # push the departure out of the event buffer
+    for _ in range(0, EVENT_BUFFER_SIZE):
+      room.make_ready(alice, True)
+
+    self.assertGreater(room.table['horizon'], version)
+
+    snapshot = room.get_table_snapshot(version)
+
+    self.assertTrue(snapshot['is_full'])
+    self.assertEqual(list(snapshot['players']), [alice])
+    self.assertEqual(snapshot['removed'], [])
+
+    # departures older than the horizon are forgotten
+    self.assertEqual(room.table['departures'], {})
+
+  def test_published_table_is_not_changed_by_later_events(self):
+    room = self.create_room()
+    alice = room.connect("alice", True)
+    table = room.table
+
+    room.draw_cards(alice, 2)
+
+    self.assertEqual(table['players'][alice]['view']['cards'], [])
+    self.assertIsNot(room.table, table)
+
+  def test_random_operations_rebuild_the_full_table(self):
+    rng = random.Random(20180101)
+    room = self.create_room()
+
+    # clients polling at their own pace. The slowest ones fall behind the event buffer
+    clients = [{'version': 0, 'room': None, 'players': {}, 'poll_rate': rate} for rate in [1.0, 0.5, 0.05, 0.002]]
+    names = iter(range(0, 1000000))
+
+    for step in range(0, 5000):
+      players = room.get_player_uids()
+      operation = rng.random()
+
+      if len(players) == 0 and room.room_locked is True:
+        # nobody can join a locked room
+        room.lock_game(False)
+      elif len(players) < MAX_PLAYERS and (len(players) == 0 or operation < 0.1):
+        room.connect("player%d" % next(names), rng.random() < 0.5)
+      elif operation < 0.15:
+        room.disconnect(rng.choice(players))
+      elif operation < 0.35:
+        # start over with a full shoe instead of running out of cards
+        if room.deck.get_remaining_cards() < 10:
+          room.init_deck()
+
+        room.draw_cards(rng.choice(players), 1)
+      elif operation < 0.5:
+        room.lock_hand(rng.choice(players), rng.random() < 0.8)
+      elif operation < 0.6:
+        room.make_ready(rng.choice(players), rng.random() < 0.7)
+      elif operation < 0.7:
+        room.new_game(rng.choice(players))
+      elif operation < 0.8:
+        room.deal_round()
+      elif operation < 0.85:
+        room.lock_game(rng.random() < 0.3)
+      else:
+        room.determine_winners()
+
+      for client in clients:
+        if rng.random() >= client['poll_rate']:
+          continue
+
+        apply_snapshot(client, room.get_table_snapshot(client['version']))
+
+        full = room.get_table_snapshot(0)
+
+        self.assertEqual(client['version'], full['version'], "step %d" % step)
+        self.assertEqual(client['room'], full['room'], "step %d" % step)
+        self.assertEqual(client['players'], full['players'], "step %d" % step)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,101 @@
+# test_simulation.py
+#
+# Copyright(c) Exequiel Ceasar Navarrete <esnavarrete1@up.edu.ph>
+# Licensed under MIT
+# Version 2.0.0
+
+import unittest
+import numpy as np
+from app.blackjack.cards.card import Card
+from app.blackjack.game.hand import Hand, compute_total
+from app.blackjack.game.error import GameError
+from app.blackjack.simulation.engine import Simulator, SimulationResult, compute_totals, \
+  WINNING_NUMBER, MAX_TRACKED_TOTAL
+
+def replay(shoes, players, stand_on):
+  # plays the same shoes one card at a time with the Hand of the game
+  result = SimulationResult(players)
+  result.rounds = len(shoes)
+
+  for shoe in shoes:
+    hands = [Hand() for _ in range(0, players)]
+
+    for player in range(0, players * 2):
+      hands[player % players].add(Card.from_code(int(shoe[player])))
+
+    cursor = players * 2
+
+    for hand in hands:
+      while hand.get_total() < stand_on and cursor < len(shoe):
+        hand.add(Card.from_code(int(shoe[cursor])))
+        cursor += 1
+
+    totals = [hand.get_total() for hand in hands]
+    qualified = [total for total in totals if total <= WINNING_NUMBER]
+    best = max(qualified) if len(qualified) > 0 else None
+    winners = 0
+
+    for player, total in enumerate(totals):
+      result.total_counts[player][min(total, MAX_TRACKED_TOTAL)] += 1
+
+      if total > WINNING_NUMBER:
+        result.busts[player] += 1
+      elif total == best:
+        result.wins[player] += 1
+        winners += 1
+
+    if winners == 0:
+      result.no_winner_rounds += 1
+    else:
+      result.winning_score_counts[best] += 1
+
+    if winners > 1:
+      result.tied_rounds += 1
+
+  return result
+
+class SimulatorTest(unittest.TestCase):
+
+  def test_totals_match_the_game_rules(self):
+    card_totals, ace_counts = np.meshgrid(np.arange(0, 32), np.arange(0, 9), indexing='ij')
+    totals = compute_totals(card_totals, ace_counts)
+
+    for card_total in range(0, 32):
+      for ace_count in range(0, 9):
+        self.assertEqual(totals[card_total, ace_count], compute_total(card_total, ace_count),
+                         "card total %d, %d aces" % (card_total, ace_count))
+
+  def test_rounds_match_the_game_rules(self):
+    for players, decks, stand_on in [(4, 1, 17), (1, 1, 21), (7, 2, 12), (26, 1, 17)]:
+      # the same seed deals the same shoes
+      shoes = Simulator(players, decks, stand_on, np.random.default_rng(7)).shuffled_shoes(500)
+      result = Simulator(players, decks, stand_on, np.random.default_rng(7)).play_batch(500)
+
+      self.assertEqual(result.to_dict(), replay(shoes, players, stand_on).to_dict(),
+                       "%d players, %d decks, stand on %d" % (players, decks, stand_on))
+
+  def test_shoes_are_permutations_of_the_decks(self):
+    shoes = Simulator(4, 2, rng=np.random.default_rng(1)).shuffled_shoes(10)
+
+    for shoe in shoes:
+      self.assertEqual(sorted(shoe.tolist()), sorted(list(range(0, 52)) * 2))
+
+  def test_run_plays_every_round_in_batches(self):
+    result = Simulator(3, rng=np.random.default_rng(3)).run(1050, batch_size=100)
+
+    self.assertEqual(result.rounds, 1050)
+    self.assertEqual(int(result.total_counts.sum()), 1050 * 3)
+    self.assertEqual(result.no_winner_rounds + int(result.winning_score_counts.sum()), 1050)
+
+  def test_settings_are_checked(self):
+    self.assertRaises(GameError, Simulator, 0)
+    self.assertRaises(GameError, Simulator, 4, 0)
+    self.assertRaises(GameError, Simulator, 4, 1, 0)
+    self.assertRaises(GameError, Simulator, 4, 1, WINNING_NUMBER + 1)
+    self.assertRaises(GameError, Simulator, 27, 1)
+
+  def test_results_of_different_tables_are_not_merged(self):
+    self.assertRaises(GameError, SimulationResult(4).merge, SimulationResult(3))
+
+if __name__ == "__main__":
+  unittest.main()